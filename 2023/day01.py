@@ -1,6 +1,10 @@
 import doctest
+import functools
+import re
 from typing import Iterator
 
+from aoc import engines, trace
+
 day = "01"  # https://adventofcode.com/2023/day/1
 
 example1 = """\
@@ -20,20 +24,11 @@ zoneight234
 7pqrstsixteen
 """
 
-replacements = {
-    "one": "o1e",
-    "two": "t2o",
-    "three": "t3e",
-    "four": "4",
-    "five": "5e",
-    "six": "6",
-    "seven": "7n",
-    "eight": "e8t",
-    "nine": "n9e",
-}
+words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
 
 
-def part_one(puzzle: list[str]) -> list[int]:
+@engines.dispatch
+def part_one(puzzle: list[str] | bytes) -> list[int]:
     """Solve part one of the puzzle.
 
     >>> part_one(example1.splitlines())
@@ -44,8 +39,37 @@ def part_one(puzzle: list[str]) -> list[int]:
 
     >>> sum(part_one(open(f"2023/day{day}.in")))
     55130
+
+    >>> part_one(example1.splitlines(), engine="buffer")
+    [12, 38, 15, 77]
+
+    >>> import os
+    >>> from unittest.mock import patch
+    >>> with patch.dict(os.environ, AOC_VERIFY="reference"):
+    ...     sum(part_one(open(f"2023/day{day}.in", "rb").read(), engine="buffer"))
+    55130
+    """
+    lines = puzzle.splitlines() if isinstance(puzzle, bytes) else puzzle  # or the whole input
+    return [t[0] * 10 + t[-1] for t in scan(lines)]
+
+
+@part_one.register("buffer")
+def part_one_buffer(puzzle: list[str] | bytes) -> list[int]:
+    """Solve part one on the whole input at once, as bytes: all but the digits and newlines
+    deleted by a single `bytes.translate`, the first and last digit of every line remain.
+
+    >>> part_one_buffer(b"1abc2\\nabc\\n")
+    Traceback (most recent call last):
+    ...
+    IndexError: index out of range
     """
-    return [t[0] * 10 + t[-1] for t in scan(puzzle)]
+    if isinstance(puzzle, bytes):
+        buffer = puzzle.removesuffix(b"\n")
+    else:
+        buffer = "\n".join(line.rstrip("\n") for line in puzzle).encode()
+    if not buffer:
+        return []
+    return [(d[0] - 48) * 10 + d[-1] - 48 for d in buffer.translate(None, others).split(b"\n")]
 
 
 def part_two(puzzle: list[str]) -> list[int]:
@@ -57,18 +81,53 @@ def part_two(puzzle: list[str]) -> list[int]:
     >>> sum(part_two(example2.splitlines()))
     281
 
+    >>> sum(part_two(example2.encode().splitlines()))
+    281
+
     >>> sum(part_two(open(f"2023/day{day}.in")))
     54985
     """
-    return [t[0] * 10 + t[-1] for t in scan(puzzle, replacements)]
+    return [t[0] * 10 + t[-1] for t in scan(puzzle, words)]
 
 
-def scan(puzzle: list[str], reps: dict[str, str] = {}) -> Iterator[tuple[int, ...]]:
+@trace.traced
+def scan(puzzle: list[str] | list[bytes], words: list[str] = []) -> Iterator[tuple[int, ...]]:
+    """Return the first and last digit of every line, spelled out or not.
+
+    Every line is searched once from its start and once, reversed, from its end for the
+    leftmost of the digits and the (reversed) words, so the search stops at the first match
+    and overlapping words as `eightwo` need no special care.
+
+    >>> list(scan(["zoneight234", "eightwo", "abc"], words))
+    [(1, 4), (8, 2), ()]
+    """
+    first, last = patterns(tuple(words))
     for line in puzzle:
-        for k, v in reps.items():
-            line = line.replace(k, v)
-        digits = [c for c in line if c.isdigit()]
-        yield tuple(map(int, digits))
+        line = line.encode() if isinstance(line, str) else line
+        if m := first.search(line):
+            n = last.search(line[::-1])
+            yield values[m[0]], values[n[0]]  # type: ignore
+        else:
+            yield ()
+
+
+@functools.cache
+def patterns(words: tuple[str, ...]) -> tuple[re.Pattern[bytes], re.Pattern[bytes]]:
+    """Return the patterns of the digits and words, forward and reversed."""
+    forward = [w.encode() for w in words]
+    return (
+        re.compile(b"|".join([rb"\d", *forward])),
+        re.compile(b"|".join([rb"\d", *(w[::-1] for w in forward)])),
+    )
+
+
+# the bytes deleted from the input, leaving the digits of its lines
+others = bytes(set(range(256)) - set(b"0123456789\n"))
+
+# the value of every match, the reversed words included
+values = {str(i).encode(): i for i in range(10)}
+values |= {w.encode(): i for i, w in enumerate(words, 1)}
+values |= {w.encode()[::-1]: i for i, w in enumerate(words, 1)}
 
 
 def load_tests(loader, tests, ignore):
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import bisect
 import doctest
-import functools
-import re
 from dataclasses import dataclass
-from typing import Iterator, cast
+from typing import Iterator
+
+from aoc import trace
 
 day = "02"  # https://adventofcode.com/2023/day/2
 
@@ -19,7 +20,7 @@ Game 5: 6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green
 example2 = example1
 
 
-@dataclass
+@dataclass(slots=True)
 class RGB:
     """RGB color representation of sets of cubes."""
 
@@ -27,9 +28,73 @@ class RGB:
     g: int
     b: int
 
+
+@dataclass(slots=True)
+class Games:
+    """The ids of the games, and the most cubes of every color shown in them, by column."""
+
+    ids: list[int]
+    r: list[int]
+    g: list[int]
+    b: list[int]
+
     @classmethod
-    def union(cls, l, r) -> RGB:
-        return RGB(max(l.r, r.r), max(l.g, r.g), max(l.b, r.b))
+    def from_puzzle(cls, puzzle: list[str]) -> Games:
+        games = cls([], [], [], [])
+        for idx, r, g, b in scan(puzzle):
+            games.ids.append(idx)
+            games.r.append(r)
+            games.g.append(g)
+            games.b.append(b)
+        return games
+
+    def possible(self, limits: RGB) -> list[int]:
+        return [
+            idx
+            for idx, r, g, b in zip(self.ids, self.r, self.g, self.b)
+            if r <= limits.r and g <= limits.g and b <= limits.b
+        ]
+
+    def powers(self) -> list[int]:
+        return [r * g * b for r, g, b in zip(self.r, self.g, self.b)]
+
+
+class Index:
+    """The sums of the ids of the games possible under any limits.
+
+    The most cubes of every color are compressed to their distinct values, and the ids summed
+    in a 3D table of prefix sums over them: the games within limits dominate no more than
+    them in all three colors, so a query is three bisections and one lookup, whatever the
+    number of games. The table has a cell per triple of distinct values, few as cubes are.
+
+    >>> index = Index(Games.from_puzzle(example1.splitlines()))
+    >>> index.id_sum(RGB(12, 13, 14)), index.id_sum(RGB(6, 3, 6)), index.id_sum(RGB(99, 99, 99))
+    (8, 8, 15)
+    """
+
+    def __init__(self, games: Games) -> None:
+        self.rs, self.gs, self.bs = (
+            sorted(set(games.r)),
+            sorted(set(games.g)),
+            sorted(set(games.b)),
+        )
+        nr, ng, nb = len(self.rs), len(self.gs), len(self.bs)
+        ri, gi, bi = ({v: i for i, v in enumerate(vs)} for vs in (self.rs, self.gs, self.bs))
+        self.sums = sums = [0] * (nr * ng * nb)  # at (r * ng + g) * nb + b
+        for idx, r, g, b in zip(games.ids, games.r, games.g, games.b):
+            sums[(ri[r] * ng + gi[g]) * nb + bi[b]] += idx
+        for stride, n in ((ng * nb, nr), (nb, ng), (1, nb)):  # prefix sums along each axis
+            for k in range(len(sums)):
+                if k // stride % n:
+                    sums[k] += sums[k - stride]
+
+    def id_sum(self, limits: RGB) -> int:
+        r = bisect.bisect_right(self.rs, limits.r) - 1
+        g = bisect.bisect_right(self.gs, limits.g) - 1
+        b = bisect.bisect_right(self.bs, limits.b) - 1
+        if r < 0 or g < 0 or b < 0:
+            return 0
+        return self.sums[(r * len(self.gs) + g) * len(self.bs) + b]
 
 
 def part_one(puzzle: list[str], limits: RGB = RGB(12, 13, 14)) -> list[int]:
@@ -44,12 +109,7 @@ def part_one(puzzle: list[str], limits: RGB = RGB(12, 13, 14)) -> list[int]:
     >>> sum(part_one(open(f"2023/day{day}.in")))
     2101
     """
-    result = []
-    for idx, game in enumerate(scan(puzzle), start=1):
-        game = functools.reduce(lambda x, y: RGB.union(x, y), game)
-        if game.r <= limits.r and game.g <= limits.g and game.b <= limits.b:
-            result.append(idx)
-    return result
+    return Games.from_puzzle(puzzle).possible(limits)
 
 
 def part_two(puzzle: list[str]) -> list[int]:
@@ -64,29 +124,46 @@ def part_two(puzzle: list[str]) -> list[int]:
     >>> sum(part_two(open(f"2023/day{day}.in")))
     58269
     """
-    result = []
-    for game in scan(puzzle):
-        game = functools.reduce(lambda x, y: RGB.union(x, y), game)
-        result.append(game.r * game.g * game.b)
-    return result
+    return Games.from_puzzle(puzzle).powers()
+
 
+def id_sums(puzzle: list[str], limits: list[RGB]) -> list[int]:
+    """Return the sum of the ids of the possible games for every limits.
 
-def scan(puzzle: list[str]) -> Iterator[list[RGB]]:
-    r1 = re.compile(r"Game (?:\d+): (?P<sets>.*)")
-    r2 = re.compile(r"(?P<cubes>\d+) (?P<color>\w+)")
+    >>> id_sums(example1.splitlines(), [RGB(12, 13, 14), RGB(20, 13, 15), RGB(0, 0, 0)])
+    [8, 15, 0]
+
+    >>> id_sums(open(f"2023/day{day}.in"), [RGB(12, 13, 14)])
+    [2101]
+    """
+    index = Index(Games.from_puzzle(puzzle))
+    return [index.id_sum(limit) for limit in limits]
+
+
+@trace.traced
+def scan(puzzle: list[str] | list[bytes]) -> Iterator[tuple[int, int, int, int]]:
+    """Return the id of every game with the most red, green and blue cubes shown in it.
+
+    The words of the line come in pairs after the id, a count and a color, which first letter
+    (a character, or a byte) is enough to tell which running maximum the count updates.
+
+    >>> list(scan(["Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green"]))
+    [(3, 20, 13, 6)]
+
+    >>> list(scan([b"Game 12: 1 blue; 2 red"]))
+    [(12, 2, 0, 1)]
+    """
     for line in puzzle:
-        game, sets = [], cast(re.Match[str], r1.match(line)).group("sets")
-        for s in sets.split("; "):
-            r, g, b = 0, 0, 0
-            for c in r2.finditer(s):
-                if c.group("color") == "red":
-                    r = int(c.group("cubes"))
-                elif c.group("color") == "green":
-                    g = int(c.group("cubes"))
-                elif c.group("color") == "blue":
-                    b = int(c.group("cubes"))
-            game.append(RGB(r, g, b))
-        yield game
+        words, most = line.split(), [0, 0, 0]
+        for count, color in zip(words[2::2], words[3::2]):
+            i = colors[color[0]]
+            if (n := int(count)) > most[i]:
+                most[i] = n
+        yield int(words[1][:-1]), most[0], most[1], most[2]
+
+
+# the running maximum of a color, by its first letter as a character and as a byte
+colors = {"r": 0, "g": 1, "b": 2} | {ord("r"): 0, ord("g"): 1, ord("b"): 2}
 
 
 def load_tests(loader, tests, ignore):
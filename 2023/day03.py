@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import doctest
-import operator
+import itertools
 import re
-import uuid
+from collections import deque
 from dataclasses import dataclass
 from typing import Iterator
 
+from aoc import engines, trace
+
 day = "03"  # https://adventofcode.com/2023/day/3
 
 example1 = """\
@@ -25,29 +27,60 @@ example1 = """\
 example2 = example1
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Point:
     """A point in the grid."""
 
     x: int
     y: int
 
-    def adjacent(self, ln: int = 1) -> list[Point]:
-        """Return the adjacent points."""
-        points = [
-            Point(self.x - 1, self.y - 1),
-            Point(self.x - 1, self.y),
-            Point(self.x - 1, self.y + 1),
-            Point(self.x + ln, self.y - 1),
-            Point(self.x + ln, self.y),
-            Point(self.x + ln, self.y + 1),
-        ]
-        for i in range(ln):
-            points.append(Point(self.x + i, self.y - 1))
-            points.append(Point(self.x + i, self.y + 1))
-        return points
 
+@dataclass(slots=True)
+class Labels:
+    """The numbers of the schematic as labels: the id of the number over every cell of a flat
+    grid, -1 on the others, and the value of every id. The grid has a border of -1, a column
+    on the right and a row above and below, so the neighbours of a cell are always in it.
+
+    >>> labels = Labels.from_puzzle(example1.splitlines())
+    >>> labels.width, labels.values[:3], labels.cells[labels.width : labels.width + 4]
+    (10, [467, 114, 35], [0, 0, 0, -1])
+
+    >>> [labels.values[i] for i in labels.around(labels.symbols[0][0])]
+    [467, 35]
+    """
 
+    width: int
+    cells: list[int]
+    values: list[int]
+    symbols: list[tuple[int, str]]  # the cells of the symbols, with them
+
+    @classmethod
+    def from_puzzle(cls, puzzle: list[str]) -> Labels:
+        tokens = list(scan(puzzle))
+        width = max((p.x + len(s) for p, s in tokens), default=0) + 1
+        height = max((p.y for p, _ in tokens), default=0) + 1
+        labels = cls(width, [-1] * (width * (height + 2)), [], [])
+        for p, s in tokens:
+            i = (p.y + 1) * width + p.x
+            if s[0].isdigit():
+                labels.cells[i : i + len(s)] = [len(labels.values)] * len(s)
+                labels.values.append(int(s))
+            else:
+                labels.symbols.append((i, s))
+        return labels
+
+    def around(self, i: int) -> list[int]:
+        """Return the ids of the numbers next to the cell, in order."""
+        w, cells = self.width, self.cells
+        ids = {
+            cells[j]
+            for j in (i - w - 1, i - w, i - w + 1, i - 1, i + 1, i + w - 1, i + w, i + w + 1)
+        }
+        ids.discard(-1)
+        return sorted(ids)
+
+
+@engines.dispatch
 def part_one(puzzle: list[str]) -> tuple[list[int], list[int]]:
     """Solve part one of the puzzle.
 
@@ -57,21 +90,29 @@ def part_one(puzzle: list[str]) -> tuple[list[int], list[int]]:
     >>> sum(part_one(example1.splitlines())[0])
     4361
 
+    >>> part_one(["..1", "*#.", "..."])
+    ([1], [])
+
     >>> sum(part_one(open(f"2023/day{day}.in"))[0])
     556367
+
+    >>> part_one(example1.splitlines(), engine="stream") == part_one(example1.splitlines())
+    True
+
+    >>> sum(part_one(open(f"2023/day{day}.in"), engine="stream")[0])
+    556367
     """
-    input, adj, ndj = list(scan(puzzle)), [], []
-    symbols = {p for p, s in input if not s[0].isdigit()}
-    for p, s in input:
-        if not s[0].isdigit():
-            continue
-        if any(p in symbols for p in p.adjacent(len(s))):
-            adj.append(int(s))
-        else:
-            ndj.append(int(s))
+    labels = Labels.from_puzzle(puzzle)
+    parts = [False] * len(labels.values)
+    for i, _ in labels.symbols:
+        for id in labels.around(i):
+            parts[id] = True
+    adj = [v for v, part in zip(labels.values, parts) if part]
+    ndj = [v for v, part in zip(labels.values, parts) if not part]
     return sorted(adj), sorted(ndj)
 
 
+@engines.dispatch
 def part_two(puzzle: list[str]) -> list[tuple[int, int]]:
     """Solve part two of the puzzle.
 
@@ -83,30 +124,81 @@ def part_two(puzzle: list[str]) -> list[tuple[int, int]]:
 
     >>> sum(map(lambda t: t[0] * t[1], part_two(open(f"2023/day{day}.in"))))
     89471771
+
+    >>> part_two(example2.splitlines(), engine="stream")
+    [(35, 467), (598, 755)]
+
+    >>> sum(map(lambda t: t[0] * t[1], part_two(open(f"2023/day{day}.in"), engine="stream")))
+    89471771
     """
-    input, nums, gears = list(scan(puzzle)), {}, []
-    for p, s in input:
-        if not s[0].isdigit():
-            continue
-        id = uuid.uuid4()
-        for i in range(len(s)):
-            nums[Point(p.x + i, p.y)] = id, int(s)
-    for p, s in input:
-        if s != "*":
-            continue
-        ns = {nums[p] for p in p.adjacent() if p in nums}
-        if len(ns) == 2:
-            gears.append(
-                (
-                    min(ns, key=operator.itemgetter(1))[1],
-                    max(ns, key=operator.itemgetter(1))[1],
-                )
-            )
+    labels, gears = Labels.from_puzzle(puzzle), []
+    for i, s in labels.symbols:
+        if s == "*" and len(ids := labels.around(i)) == 2:
+            ns = [labels.values[id] for id in ids]
+            gears.append((min(ns), max(ns)))
     return gears
 
 
+@part_one.register("stream")
+def part_one_stream(puzzle: list[str]) -> tuple[list[int], list[int]]:
+    adj, ndj = [], []
+    for parts, others, _ in stream(puzzle):
+        adj += parts
+        ndj += others
+    return sorted(adj), sorted(ndj)
+
+
+@part_two.register("stream")
+def part_two_stream(puzzle: list[str]) -> list[tuple[int, int]]:
+    return [gear for _, _, gears in stream(puzzle) for gear in gears]
+
+
+def stream(puzzle: list[str]) -> Iterator[tuple[list[int], list[int], list[tuple[int, int]]]]:
+    """Return the part numbers, the other numbers and the gears of every row, as soon as the
+    row below it is read: only three rows, with their numbers, are held at any time.
+
+    >>> [gears for _, _, gears in stream(example1.splitlines())]
+    [[], [(35, 467)], [], [], [], [], [], [], [(598, 755)], []]
+
+    >>> from aoc.generate import generate
+    >>> puzzle = generate("03", 4)
+    >>> any(re.search(r"[*#+$]{2}", line) for line in puzzle)  # runs of symbols
+    True
+    >>> [part(puzzle, engine="stream") == part(puzzle) for part in (part_one, part_two)]
+    [True, True]
+    """
+    rows = deque([("", [])], maxlen=3)  # the rows above, at and below the row solved
+    for line in itertools.chain((line.rstrip("\n") for line in puzzle), [""]):
+        rows.append((line, [(m.start(), m.end(), int(m[0])) for m in NUMBER.finditer(line)]))
+        if len(rows) < 3:
+            continue
+        (above, _), (row, numbers), (below, _) = rows
+        parts, others, gears = [], [], []
+        for start, end, n in numbers:
+            if any(SYMBOL.search(r, max(start - 1, 0), end + 1) for r in (above, row, below)):
+                parts.append(n)
+            else:
+                others.append(n)
+        for x in (m.start() for m in GEAR.finditer(row)):
+            ns = [
+                n for _, numbers in rows for start, end, n in numbers if start <= x + 1 <= end + 1
+            ]
+            if len(ns) == 2:
+                gears.append((min(ns), max(ns)))
+        yield parts, others, gears
+
+
+NUMBER, SYMBOL, GEAR = re.compile(r"\d+"), re.compile(r"[^.\d]"), re.compile(r"\*")
+
+
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[tuple[Point, str]]:
-    r = re.compile(r"(?P<num>\d+)|(?P<sym>[^\.\d\n]+)")
+    """Return the numbers and the symbols of the schematic, one token per symbol.
+
+    >>> list(scan(["..1", "*#."]))
+    [(Point(x=2, y=0), '1'), (Point(x=0, y=1), '*'), (Point(x=1, y=1), '#')]
+    """
+    r = re.compile(r"(?P<num>\d+)|(?P<sym>[^\.\d\n])")
     for y, line in enumerate(puzzle):
         for m in r.finditer(line):
             yield Point(m.start(), y), m.group()
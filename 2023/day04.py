@@ -1,7 +1,10 @@
 import doctest
-import re
+from collections import deque
 from typing import Iterator
 
+from aoc import bitset, trace
+from aoc.tokens import ints
+
 day = "04"  # https://adventofcode.com/2023/day/4
 
 example1 = """\
@@ -28,39 +31,92 @@ def part_one(puzzle: list[str]) -> list[int]:
     >>> sum(part_one(open(f"2023/day{day}.in")))
     25183
     """
-    result = []
-    for g1, g2 in scan(puzzle):
-        if inter := g1.intersection(g2):
-            result.append(2 ** (len(inter) - 1))
-        else:
-            result.append(0)
-    return result
+    return [2 ** (n - 1) if n else 0 for n in matches(puzzle)]
 
 
-def part_two(puzzle: list[str], n: int) -> list[int]:
+def part_two(puzzle: list[str]) -> list[int]:
     """Solve part two of the puzzle.
 
-    >>> part_two(example2.splitlines(), 6)
+    >>> part_two(example2.splitlines())
     [1, 2, 4, 8, 14, 1]
 
-    >>> sum(part_two(example2.splitlines(), 6))
+    >>> sum(part_two(example2.splitlines()))
     30
 
-    >>> sum(part_two(open(f"2023/day{day}.in"), 213))
+    >>> sum(part_two(open(f"2023/day{day}.in")))
     5667240
     """
-    cards = [1] * n
-    for i, (g1, g2) in enumerate(scan(puzzle)):
-        for j in range(len(g1.intersection(g2))):
-            cards[i + j + 1] += cards[i]
-    return cards
+    return [copies for copies, _ in stream(puzzle)]
+
+
+def stream(puzzle: list[str]) -> Iterator[tuple[int, int]]:
+    """Return the copies of every card with the running total of the cards, as they are read.
+
+    The copies won for the next cards wait in a deque as long as the most matches of a card
+    so far, its head popped by the next card, so the pile may be of any length. The halves of
+    every card are the bitsets of the cached bits of their tokens, as in `matches`.
+
+    >>> list(stream(example2.splitlines()))
+    [(1, 1), (2, 3), (4, 7), (8, 15), (14, 29), (1, 30)]
+    """
+    pending, total, get = deque(), 0, bits.__getitem__
+    for line in puzzle:
+        g1, _, g2 = line.partition(":")[2].partition("|")
+        copies = 1 + (pending.popleft() if pending else 0)
+        total += copies
+        yield copies, total
+        won = (sum(map(get, g1.split())) & sum(map(get, g2.split()))).bit_count()
+        pending.extend([0] * (won - len(pending)))
+        for j in range(won):
+            pending[j] += copies
+
 
+class Bits(dict[str, int]):
+    """The bit of every number, by its token, computed on first use."""
 
-def scan(puzzle: list[str]) -> Iterator[tuple[set[int], set[int]]]:
-    r = re.compile(r"Card\s+\d+:(.*)\|(.*)")
+    def __missing__(self, token: str) -> int:
+        bit = self[token] = 1 << int(token)
+        return bit
+
+
+bits = Bits()
+
+
+def matches(puzzle: list[str]) -> list[int]:
+    """Return the number of winning numbers had on every card, the whole pile at once.
+
+    The pile is split into tokens in one call, and cut into cards of as many tokens as the
+    first one. The two halves of a card are bitsets summing the bits of their tokens, which
+    are distinct, looked up with `map` over the slices: no per-line parsing and no sets.
+    Piles of cards of different lengths are scanned line by line.
+
+    >>> matches(example1.splitlines())
+    [4, 2, 2, 1, 0, 0]
+    """
+    puzzle = list(puzzle)
+    tokens = " ".join(puzzle).split()
+    if not tokens:
+        return []
+    bar = tokens.index("|")
+    stride = next((i for i in range(bar, len(tokens)) if tokens[i] == "Card"), len(tokens))
+    cards = len(tokens) // stride
+    if len(tokens) % stride or tokens[bar::stride].count("|") != cards:
+        return [(g1 & g2).bit_count() for g1, g2 in scan(puzzle)]
+    get = bits.__getitem__
+    return [
+        (
+            sum(map(get, tokens[k + 2 : k + bar]))
+            & sum(map(get, tokens[k + bar + 1 : k + stride]))
+        ).bit_count()
+        for k in range(0, len(tokens), stride)
+    ]
+
+
+@trace.traced
+def scan(puzzle: list[str]) -> Iterator[tuple[int, int]]:
     for line in puzzle:
-        g1, g2 = r.match(line).groups()  # pyright: ignore [reportOptionalMemberAccess]
-        yield set(map(int, g1.split())), set(map(int, g2.split()))
+        g1, _, g2 = line.partition(":")[2].partition("|")
+        yield bitset.from_indices(ints(g1)), bitset.from_indices(ints(g2))
 
 
 def load_tests(loader, tests, ignore):
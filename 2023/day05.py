@@ -1,8 +1,10 @@
 import bisect
-import collections
 import doctest
 import operator
-import re
+from array import array
+
+from aoc import trace
+from aoc.tokens import ints
 
 day = "05"  # https://adventofcode.com/2023/day/5
 
@@ -44,7 +46,17 @@ humidity-to-location map:
 
 example2 = example1
 
-Map = collections.namedtuple("Map", ["fr", "to", "dlt"])
+
+class Maps:
+    """Ranges of a map sorted by their start, held in `fr`, `to` and `dlt` columns."""
+
+    __slots__ = ("fr", "to", "dlt")
+
+    def __init__(self, ranges: list[tuple[int, int, int]]) -> None:
+        self.fr, self.to, self.dlt = (array("q", col) for col in zip(*sorted(ranges)))
+
+    def __len__(self) -> int:
+        return len(self.fr)
 
 
 def part_one(puzzle: list[str]) -> list[tuple[int, ...]]:
@@ -69,8 +81,8 @@ def part_one(puzzle: list[str]) -> list[tuple[int, ...]]:
     for seed in seeds:
         path = [seed]
         for maps in levels:
-            m = maps[bisect.bisect(maps, path[-1], key=operator.attrgetter("fr")) - 1]
-            path.append(path[-1] + m.dlt if m.to > path[-1] else path[-1])
+            i = bisect.bisect(maps.fr, path[-1]) - 1
+            path.append(path[-1] + maps.dlt[i] if maps.to[i] > path[-1] else path[-1])
         paths.append(tuple(path))
     return paths
 
@@ -93,11 +105,11 @@ def part_two(puzzle: list[str]) -> list[tuple[int, int]]:
         new_ranges = []
         for r in ranges:
             while r[0] < r[1]:
-                idx = bisect.bisect(maps, r[0], key=operator.attrgetter("fr")) - 1
-                if (m := maps[idx]).to > r[0]:
-                    dlt, to = m.dlt, m.to
+                idx = bisect.bisect(maps.fr, r[0]) - 1
+                if maps.to[idx] > r[0]:
+                    dlt, to = maps.dlt[idx], maps.to[idx]
                 else:
-                    dlt, to = 0, maps[idx + 1].fr if idx + 1 < len(maps) else r[1]
+                    dlt, to = 0, maps.fr[idx + 1] if idx + 1 < len(maps) else r[1]
                 new_ranges.append((r[0] + dlt, min(to, r[1]) + dlt))
                 r = (to, r[1])
         ranges = []
@@ -109,21 +121,18 @@ def part_two(puzzle: list[str]) -> list[tuple[int, int]]:
     return ranges
 
 
-def scan(puzzle: list[str]) -> tuple[list[int], tuple[list[Map], ...]]:
+@trace.traced
+def scan(puzzle: list[str]) -> tuple[list[int], tuple[Maps, ...]]:
     maps, seeds = [], []
     for line in puzzle:
         if line.startswith("seeds:"):
-            seeds = list(map(int, re.findall(r"(\d+)+", line)))
+            seeds = ints(line)
         elif line.rstrip().endswith(":"):
             maps.append([(0, 0, 0)])  # bisect requires initial value
         elif line.rstrip():
-            maps[-1].append(tuple(map(int, line.split())))
-    for i in range(len(maps)):  # post-processing
-        maps[i] = sorted(
-            map(lambda t: Map(fr=t[1], to=t[1] + t[2], dlt=t[0] - t[1]), maps[i]),
-            key=operator.itemgetter(0),
-        )
-    return seeds, tuple(maps)
+            dst, src, ln = ints(line)
+            maps[-1].append((src, src + ln, dst - src))
+    return seeds, tuple(map(Maps, maps))
 
 
 def load_tests(loader, tests, ignore):
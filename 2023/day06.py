@@ -1,6 +1,8 @@
 import doctest
 import math
-import re
+
+from aoc import trace
+from aoc.tokens import ints
 
 day = "06"  # https://adventofcode.com/2023/day/6
 
@@ -66,18 +68,19 @@ def solve(t: int, d: int) -> tuple[int, int]:
     return n1, n2
 
 
+@trace.traced
 def scan(puzzle: list[str], collapsed: bool = False) -> list[tuple[int, int]]:
     for line in puzzle:
         if line.startswith("Time:"):
             if collapsed:
-                time = int("".join(re.findall(r"\d+", line)))
+                time = ints(line.replace(" ", ""))[0]
             else:
-                times = list(map(int, re.findall(r"\d+", line)))
+                times = ints(line)
         elif line.startswith("Distance:"):
             if collapsed:
-                distance = int("".join(re.findall(r"\d+", line)))
+                distance = ints(line.replace(" ", ""))[0]
             else:
-                distances = list(map(int, re.findall(r"\d+", line)))
+                distances = ints(line)
     return [(time, distance)] if collapsed else list(zip(times, distances))  # type: ignore
 
 
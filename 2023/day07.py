@@ -5,6 +5,8 @@ import doctest
 from enum import Enum, auto
 from typing import Iterator
 
+from aoc import trace
+
 day = "07"  # https://adventofcode.com/2023/day/7
 
 example1 = """\
@@ -124,6 +126,7 @@ def opt(hand: str) -> str:
     return hand.replace("J", c.most_common()[0][0] if c else "J")
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[tuple[str, int]]:
     for line in puzzle:
         els = line.split()
@@ -2,6 +2,9 @@ import doctest
 import itertools
 import re
 
+from aoc import fanout, trace
+from aoc.checkpoint import Checkpoint
+
 day = "08"  # https://adventofcode.com/2023/day/8
 
 example11 = """\
@@ -65,12 +68,23 @@ def part_one(puzzle: list[str]) -> list[str]:
     return path
 
 
-def part_two(puzzle: list[str]) -> list[int]:
+def part_two(puzzle: list[str], checkpoint: Checkpoint | None = None) -> list[int]:
     """Solve part two of the puzzle.
 
+    The walks are shared among the `fanout` workers, or with a checkpoint walked in turn,
+    saving the walks done and the position and steps of the current walk as it goes.
+
     >>> part_two(example2.splitlines())
     [2, 3]
 
+    >>> import os, tempfile
+    >>> tmp = tempfile.TemporaryDirectory()
+    >>> cp = Checkpoint(os.path.join(tmp.name, "day08"), interval=0)
+    >>> cp.save(([2], ("22C", 2)))
+    >>> part_two(example2.splitlines(), checkpoint=cp), cp.load()
+    ([2, 3], None)
+    >>> tmp.cleanup()
+
     >>> import math
     >>> math.lcm(*part_two(example2.splitlines()))
     6
@@ -79,16 +93,32 @@ def part_two(puzzle: list[str]) -> list[int]:
     13385272668829
     """
     ins, nodes = scan(puzzle)
-    nodes, ns = {n[0]: n[1:] for n in nodes}, []
-    for node in [k for k in nodes.keys() if k.endswith("A")]:
-        for i, j in enumerate(itertools.cycle(ins)):
-            if node.endswith("Z"):
-                ns.append(i)
-                break
-            node = nodes[node][j]
+    nodes, ns, walk = {n[0]: n[1:] for n in nodes}, [], None
+    starts = [k for k in nodes.keys() if k.endswith("A")]
+    if not checkpoint:
+        return fanout.fanout(steps, (ins, nodes), starts, reduce=list)
+    if state := checkpoint.load():
+        ns, walk = state
+    for start in starts[len(ns) :]:
+        node, i = walk or (start, 0)
+        while not node.endswith("Z"):
+            node, i = nodes[node][ins[i % len(ins)]], i + 1
+            if not i % 4096:
+                checkpoint.tick(lambda: (ns, (node, i)))
+        ns.append(i)
+        walk = None
+    checkpoint.clear()
     return ns
 
 
+def steps(network: tuple[list[int], dict[str, tuple[str, str]]], node: str) -> int:
+    (ins, nodes), i = network, 0
+    while not node.endswith("Z"):
+        node, i = nodes[node][ins[i % len(ins)]], i + 1
+    return i
+
+
+@trace.traced
 def scan(puzzle: list[str]) -> tuple[list[int], list[tuple[str, str, str]]]:
     ins, nodes, r = [], [], re.compile(r"(\w{3}) = \((\w{3}), (\w{3})\)")
     for line in puzzle:
@@ -2,6 +2,8 @@ import doctest
 import itertools
 from typing import Iterator
 
+from aoc import trace
+
 day = "09"  # https://adventofcode.com/2023/day/9
 
 example1 = """\
@@ -60,9 +62,10 @@ def part_two(puzzle: list[str]) -> list[int]:
     return result
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[list[int]]:
     for line in puzzle:
-        yield list(map(int, line.split()))
+        yield list(map(int, line.split()))  # fixed format, faster than a pattern
 
 
 def load_tests(loader, tests, ignore):
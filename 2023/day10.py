@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import doctest
 from enum import Enum
-from typing import Iterator, Literal
+from typing import Iterator
+
+from aoc import tables, trace
 
 day = "10"  # https://adventofcode.com/2023/day/10
 
@@ -72,7 +74,7 @@ class Dir(Enum):
         return self.name
 
     def inv(self) -> Dir:
-        return Dir[self.value[1]]
+        return DIRS[OPPOSITES[INDEX[self]]]
 
 
 class Tile(Enum):
@@ -85,15 +87,29 @@ class Tile(Enum):
     STRT = ("S", None, None)
     GND = (".", None, None)
 
-    def other(self, d: Dir) -> Literal[Dir.N, Dir.W, Dir.E, Dir.S]:
-        d1, d2 = self.value[1], self.value[2]
-        if d.inv() != d1 and d.inv() != d2:
+    def other(self, d: Dir) -> Dir:
+        """Return the direction leaving the tile entered in the direction `d`.
+
+        >>> Tile.ESPIPE.other(Dir.W), Tile.NSPIPE.other(Dir.N)
+        (S, N)
+        """
+        if not (turns := TURNS[ord(self.value[0]) * 4 + INDEX[d]]):
             raise ValueError(f"{d} not supported by {self}")
-        return d1 if d.inv() == d2 else d2  # pyright: ignore [reportReturnType]
+        return DIRS[turns.bit_length() - 1]
 
     @classmethod
     def from_str(cls, s: str) -> Tile:
-        return next(t for t in cls if s == t.value[0])
+        return TILES[s]
+
+
+# the tables of the walk, by direction in the order N, E, S, W
+DIRS = list(Dir)
+INDEX = {d: i for i, d in enumerate(DIRS)}
+STEPS = tables.offsets("NESW")
+OPPOSITES = tables.opposites("NESW")
+TURNS = tables.transitions("NESW", tables.pipes())  # at `ord(tile) * 4 + d`
+
+TILES = {t.value[0]: t for t in Tile}
 
 
 def part_one(puzzle: list[str]) -> list[tuple[int, int, Dir]]:
@@ -137,20 +153,8 @@ def part_one(puzzle: list[str]) -> list[tuple[int, int, Dir]]:
     >>> len(part_one(open(f"2023/day{day}.in"))) // 2
     6599
     """
-    grid = []
-    for i, tiles in enumerate(scan(puzzle)):
-        if Tile.STRT in tiles:
-            sx, sy = tiles.index(Tile.STRT), i
-        grid.append(tiles)
-    for d in [Dir.N, Dir.E, Dir.S, Dir.W]:
-        try:
-            x, y = d(sx, sy)  # pyright: ignore [reportPossiblyUnboundVariable]
-            grid[y][x].other(d)
-        except ValueError:
-            continue
-        else:
-            break
-    return list(iter(grid, sx, sy, d))  # pyright: ignore [reportPossiblyUnboundVariable]
+    grid = list(scan(puzzle))
+    return list(iter(grid, *start(grid)))
 
 
 def part_two(puzzle: list[str]) -> list[int]:
@@ -177,20 +181,8 @@ def part_two(puzzle: list[str]) -> list[int]:
     >>> len(part_two(open(f"2023/day{day}.in")))
     477
     """
-    grid = []
-    for i, tiles in enumerate(scan(puzzle)):
-        if Tile.STRT in tiles:
-            sx, sy = tiles.index(Tile.STRT), i
-        grid.append(tiles)
-    for d in [Dir.N, Dir.E, Dir.S, Dir.W]:
-        try:
-            x, y = d(sx, sy)  # pyright: ignore [reportPossiblyUnboundVariable]
-            grid[y][x].other(d)
-        except ValueError:
-            continue
-        else:
-            break
-    enclosed, loop = [], {(x, y): d for x, y, d in iter(grid, sx, sy, d)}  # type: ignore
+    grid = list(scan(puzzle))
+    enclosed, loop = [], {(x, y): d for x, y, d in iter(grid, *start(grid))}
     for y in range(len(grid)):
         winding = 0  # https://en.wikipedia.org/wiki/Nonzero-rule
         for x in range(len(grid[y])):
@@ -204,18 +196,44 @@ def part_two(puzzle: list[str]) -> list[int]:
     return enclosed
 
 
-def iter(grid: list[list[Tile]], x: int, y: int, d: Dir) -> Iterator[tuple[int, int, Dir]]:
+def start(grid: list[str]) -> tuple[int, int, int]:
+    """Return the start and the first direction of the loop leaving it.
+
+    >>> start(list(scan(example12.splitlines())))
+    (0, 2, 1)
+    """
+    sy = next(y for y, line in enumerate(grid) if "S" in line)
+    sx = grid[sy].index("S")
+    for d, (dx, dy) in enumerate(STEPS):
+        x, y = sx + dx, sy + dy
+        if 0 <= y < len(grid) and 0 <= x < len(grid[y]) and TURNS[ord(grid[y][x]) * 4 + d]:
+            return sx, sy, d
+    raise ValueError("no pipe leaves the start")
+
+
+def iter(grid: list[str], x: int, y: int, d: int) -> Iterator[tuple[int, int, Dir]]:
+    """Return the tiles of the loop from the start, with the direction leaving them.
+
+    >>> list(iter([".S-7.", ".|.|.", ".L-.."], *start([".S-7.", ".|.|.", ".L-.."])))
+    Traceback (most recent call last):
+    ...
+    ValueError: Dir.S not supported by Tile.GND
+    """
     while True:
-        yield x, y, d
-        x, y = d(x, y)
-        if grid[y][x] == Tile.STRT:
+        yield x, y, DIRS[d]
+        dx, dy = STEPS[d]
+        x, y = x + dx, y + dy
+        if grid[y][x] == "S":
             break
-        d = grid[y][x].other(d)
+        if not (turns := TURNS[ord(grid[y][x]) * 4 + d]):
+            raise ValueError(f"{DIRS[d]} not supported by {Tile.from_str(grid[y][x])}")
+        d = turns.bit_length() - 1
 
 
-def scan(puzzle: list[str]) -> Iterator[list[Tile]]:
+@trace.traced
+def scan(puzzle: list[str]) -> Iterator[str]:
     for line in puzzle:
-        yield list(map(Tile.from_str, line))
+        yield line.rstrip("\n")
 
 
 def load_tests(loader, tests, ignore):
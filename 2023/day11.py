@@ -3,6 +3,9 @@ import itertools
 from itertools import chain
 from typing import Iterator
 
+from aoc import trace
+from aoc.sparse import Points
+
 day = "11"  # https://adventofcode.com/2023/day/11
 
 example1 = """\
@@ -34,12 +37,7 @@ def part_one(puzzle: list[str]) -> list[int]:
     >>> sum(part_one(open(f"2023/day{day}.in")))
     9233514
     """
-    galaxies = set(chain.from_iterable(scan(puzzle)))
-    xs, ys = {x for x, _ in galaxies}, {y for _, y in galaxies}
-    for x in sorted(set(range(max(xs))) - xs, reverse=True):
-        galaxies = {(g[0] + 1, g[1]) if g[0] > x else g for g in galaxies}
-    for y in sorted(set(range(max(ys))) - ys, reverse=True):
-        galaxies = {(g[0], g[1] + 1) if g[1] > y else g for g in galaxies}
+    galaxies = Points(chain.from_iterable(scan(puzzle))).expanded(2)
     return [distance(a, b) for a, b in itertools.combinations(galaxies, 2)]
 
 
@@ -55,12 +53,7 @@ def part_two(puzzle: list[str], factor: int = 1000000) -> list[int]:
     >>> sum(part_two(open(f"2023/day{day}.in")))
     363293506944
     """
-    galaxies = set(chain.from_iterable(scan(puzzle)))
-    xs, ys = {x for x, _ in galaxies}, {y for _, y in galaxies}
-    for x in sorted(set(range(max(xs))) - xs, reverse=True):
-        galaxies = {(g[0] + factor - 1, g[1]) if g[0] > x else g for g in galaxies}
-    for y in sorted(set(range(max(ys))) - ys, reverse=True):
-        galaxies = {(g[0], g[1] + factor - 1) if g[1] > y else g for g in galaxies}
+    galaxies = Points(chain.from_iterable(scan(puzzle))).expanded(factor)
     return [distance(a, b) for a, b in itertools.combinations(galaxies, 2)]
 
 
@@ -73,6 +66,7 @@ def distance(a: tuple[int, int], b: tuple[int, int]) -> int:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[list[tuple[int, int]]]:
     for y, line in enumerate(puzzle):
         yield [(x, y) for x, c in enumerate(line) if c == "#"]
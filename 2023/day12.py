@@ -3,6 +3,8 @@ import functools
 import itertools
 from typing import Iterator
 
+from aoc import engines, trace, tuning
+
 day = "12"  # https://adventofcode.com/2023/day/12
 
 example1 = """\
@@ -18,6 +20,7 @@ example1 = """\
 example2 = example1
 
 
+@engines.dispatch
 def part_one(puzzle: list[str]) -> list[int]:
     """Solve part one of the puzzle.
 
@@ -33,6 +36,7 @@ def part_one(puzzle: list[str]) -> list[int]:
     return [arrange(pattern, *groups) for pattern, groups in scan(puzzle)]
 
 
+@engines.dispatch
 def part_two(puzzle: list[str], copies: int = 5) -> list[int]:
     """Solve part two of the puzzle.
 
@@ -52,6 +56,28 @@ def part_two(puzzle: list[str], copies: int = 5) -> list[int]:
     return result
 
 
+@part_one.register("table")
+def part_one_table(puzzle: list[str]) -> list[int]:
+    return [table(pattern, groups) for pattern, groups in scan(puzzle)]
+
+
+@part_two.register("table")
+def part_two_table(puzzle: list[str], copies: int = 5) -> list[int]:
+    return [
+        table("?".join(itertools.repeat(pattern, copies)), groups * copies)
+        for pattern, groups in scan(puzzle)
+    ]
+
+
+def length(puzzle: list[str]) -> int:
+    """Return the length of the longest pattern, the size picking the `auto` engine."""
+    return max((len(line.partition(" ")[0]) for line in puzzle), default=0)
+
+
+tuning.auto(part_one, length)
+tuning.auto(part_two, length)
+
+
 @functools.cache
 def arrange(pattern: str, *groups: int) -> int:
     """Found all possible arrangements of a pattern.
@@ -87,10 +113,38 @@ def arrange(pattern: str, *groups: int) -> int:
     return cnt
 
 
+def table(pattern: str, groups: list[int]) -> int:
+    """Count the arrangements of a pattern by dynamic programming over a table, the groups
+    from the last one: `ways[i]` is the count for the pattern from `i` on and the groups
+    placed so far, without the recursion and the slicing of `arrange`.
+
+    >>> table("?###????????", [3, 2, 1]), table("????.######..#####.", [1, 6, 5])
+    (10, 4)
+
+    >>> table("?".join(["???.###"] * 5), [1, 1, 3] * 5)
+    1
+    """
+    pattern, dots = pattern + ".", [0]
+    for c in pattern:
+        dots.append(dots[-1] + (c == "."))
+    n, ways = len(pattern), [0] * (len(pattern) + 1)
+    ways[n] = 1
+    for i in range(n - 1, -1, -1):  # no groups left: no `#` either
+        ways[i] = ways[i + 1] if pattern[i] != "#" else 0
+    for ln in reversed(groups):
+        ways, nxt = [0] * (n + 1), ways
+        for i in range(n - ln - 1, -1, -1):
+            ways[i] = ways[i + 1] if pattern[i] != "#" else 0
+            if dots[i + ln] == dots[i] and pattern[i + ln] != "#":
+                ways[i] += nxt[i + ln + 1]
+    return ways[0]
+
+
 def is_group(pattern: str) -> bool:
     return "." not in pattern[:-1] and pattern[-1] != "#"
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[tuple[str, list[int]]]:
     for line in puzzle:
         pattern, groups = line.split()
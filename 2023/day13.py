@@ -1,6 +1,9 @@
 import doctest
 from typing import Iterator
 
+from aoc import trace
+from aoc.bitset import BitGrid
+
 day = "13"  # https://adventofcode.com/2023/day/13
 
 example1 = """\
@@ -39,13 +42,13 @@ def part_one(puzzle: list[str]) -> list[int]:
     """
     result = []
     for pattern in scan(puzzle):
-        cols = fold(transpose(pattern))
+        cols = pattern.transpose().rows
         for i in range(1, len(cols)):
             if reflected(cols, i):
                 result.append((i, 0))
                 break
         else:
-            rows = fold(pattern)
+            rows = pattern.rows
             for i in range(1, len(rows)):
                 if reflected(rows, i):
                     result.append((0, i))
@@ -67,11 +70,11 @@ def part_two(puzzle: list[str], copies: int = 5) -> list[int]:
     """
     result = []
     for pattern in scan(puzzle):
-        cols = fold(transpose(pattern))
+        cols = pattern.transpose().rows
         for i in range(1, len(cols)):
             if reflected(cols, i, bits=1):
                 result.append((i, 0))
-        rows = fold(pattern)
+        rows = pattern.rows
         for i in range(1, len(rows)):
             if reflected(rows, i, bits=1):
                 result.append((0, i))
@@ -85,27 +88,16 @@ def reflected(ns: list[int], pos: int, bits: int = 0) -> bool:
     return bits == 0
 
 
-def transpose(pattern: list[list[bool]]) -> list[list[bool]]:
-    return list(map(list, zip(*pattern)))
-
-
-def fold(pattern: list[list[bool]]) -> list[int]:
-    return [as_num(row) for row in pattern]
-
-
-def as_num(pattern: list[bool]) -> int:
-    return sum(2**i for i, b in enumerate(pattern) if b)
-
-
-def scan(puzzle: list[str]) -> Iterator[list[list[bool]]]:
+@trace.traced
+def scan(puzzle: list[str]) -> Iterator[BitGrid]:
     pattern = []
     for line in puzzle:
         if line.strip():
-            pattern.append([c == "#" for c in line.strip()])
+            pattern.append(line.strip())
             continue
-        yield pattern
+        yield BitGrid.from_lines(pattern)
         pattern = []
-    yield pattern
+    yield BitGrid.from_lines(pattern)
 
 
 def load_tests(loader, tests, ignore):
@@ -1,11 +1,14 @@
 import bisect
 import collections
 import doctest
-import functools
 from enum import Enum
 from itertools import pairwise
 from typing import Iterator
 
+from aoc import trace
+from aoc.checkpoint import Checkpoint
+from aoc.sparse import Points
+
 day = "14"  # https://adventofcode.com/2023/day/14
 
 example1 = """\
@@ -45,20 +48,18 @@ def part_one(puzzle: list[str]) -> list[int]:
     >>> sum(starmap(mul, enumerate(reversed(part_one(open(f"2023/day{day}.in"))), start=1)))
     110090
     """
-    rocks, cubes = [], []
-    for size, (cube_shaped, rounded) in scan(puzzle):
-        if not rocks:
-            for i in range(size):  # add border of rocks (`#`) around the grid
-                rocks.extend((Pos(i, -1), Pos(-1, i), Pos(i, size), Pos(size, i)))
-        rocks.extend(cube_shaped)
-        cubes.extend(rounded)
-    rocks = iter(rocks, size, vert=True)  # pyright: ignore [reportPossiblyUnboundVariable]
-    return list(map(len, iter(tilt(rocks, cubes, size), size)))  # type: ignore
+    size, rocks, cubes = build(puzzle)
+    return loads(tilt(rocks, cubes), size)
 
 
-def part_two(puzzle: list[str], circles: int = 1_000_000_000) -> list[int]:
+def part_two(
+    puzzle: list[str], circles: int = 1_000_000_000, checkpoint: Checkpoint | None = None
+) -> list[int]:
     """Solve part two of the puzzle.
 
+    With a checkpoint, the cycles left, the rounded rocks and the hashes of the layouts seen
+    are saved as it goes, and resumed from.
+
     >>> part_two(example2.splitlines(), circles=1)
     [0, 1, 2, 2, 3, 2, 1, 4, 1, 2]
 
@@ -75,54 +76,72 @@ def part_two(puzzle: list[str], circles: int = 1_000_000_000) -> list[int]:
 
     >>> sum(starmap(mul, enumerate(reversed(part_two(open(f"2023/day{day}.in"))), start=1)))
     95254
+
+    >>> import os, tempfile
+    >>> tmp = tempfile.TemporaryDirectory()
+    >>> cp = Checkpoint(os.path.join(tmp.name, "day14"), interval=0)
+    >>> part_two(example2.splitlines(), circles=2, checkpoint=cp)
+    [0, 1, 0, 1, 3, 2, 2, 3, 2, 4]
+    >>> tmp.cleanup()
     """
-    rocks, cubes = [], []
-    for size, (cube_shaped, rounded) in scan(puzzle):
-        if not rocks:
-            for i in range(size):  # add border of rocks (`#`) around the grid
-                rocks.extend((Pos(i, -1), Pos(-1, i), Pos(i, size), Pos(size, i)))
-        rocks.extend(cube_shaped)
-        cubes.extend(rounded)
-    loop_hash, vrocks, hrocks = {}, iter(rocks, size, vert=True), iter(rocks, size)  # type: ignore
+    (size, rocks, cubes), loop_hash = build(puzzle), {}
+    if checkpoint and (state := checkpoint.load()):
+        circles, cubes, loop_hash = state
     while circles > 0:
-        for dir, rocks in [(Dir.N, vrocks), (Dir.W, hrocks), (Dir.S, vrocks), (Dir.E, hrocks)]:
-            cubes = tilt(rocks, cubes, size, dir)  # pyright: ignore
+        for dir in (Dir.N, Dir.W, Dir.S, Dir.E):
+            cubes = tilt(rocks, cubes, dir)
         circles, hsh = circles - 1, hash(tuple(cubes))
         if hsh in loop_hash:
             circles %= loop_hash[hsh] - circles
         loop_hash[hsh] = circles
-    return list(map(len, iter(cubes, size)))  # pyright: ignore [reportPossiblyUnboundVariable]
-
+        if checkpoint:
+            checkpoint.tick(lambda: (circles, cubes, loop_hash))
+    if checkpoint:
+        checkpoint.clear()
+    return loads(cubes, size)
 
-def tilt(rs: list[list[Pos]], cs: list[Pos], n: int, d: Dir = Dir.N) -> list[Pos]:
-    new_cubes, vert, rev = [], d in (Dir.N, Dir.S), d in (Dir.S, Dir.E)
-    for rs2, cs2 in zip(map(pairwise, rs), iter(cs, n, vert=vert)):
-        lo = None
-        for r1, r2 in rs2:
-            if lo is None:
-                lo = bisect.bisect(cs2, r1)
-            lo, prev = bisect.bisect(cs2, r2, lo), lo
-            new_cubes.extend(cubes(r1, r2, lo - prev, vert=vert, rev=rev))
-    return new_cubes
-
-
-def iter(l: list[Pos], n: int, /, *, vert: bool = False) -> list[list[Pos]]:
-    l, ls, lo = sorted(l, key=lambda p: (p.x, p.y) if vert else (p.y, p.x)), [], 0
-    for i in range(-1, n):
-        hi = bisect.bisect(l, i, lo, key=lambda p: p.x if vert else p.y)
-        if i != -1:  # skip the border of rocks (`#`)
-            ls.append(l[lo:hi])
-        lo = hi
-    return ls
 
+def build(puzzle: list[str]) -> tuple[int, Points, Points]:
+    """Return the size of the grid, the cube-shaped rocks with a border of them around the
+    grid, and the rounded rocks."""
+    size, rocks, cubes = 0, [], []
+    for size, (cube_shaped, rounded) in scan(puzzle):
+        if not rocks:
+            for i in range(size):  # add border of rocks (`#`) around the grid
+                rocks.extend((Pos(i, -1), Pos(-1, i), Pos(i, size), Pos(size, i)))
+        rocks.extend(cube_shaped)
+        cubes.extend(rounded)
+    return size, Points(rocks), Points(cubes)
 
-@functools.cache
-def cubes(p1: Pos, p2: Pos, n: int, /, *, vert: bool = False, rev: bool = False) -> list[Pos]:
-    delta = (0, 1) if vert else (1, 0)
-    p, delta = (p1, delta) if not rev else (p2, (-delta[0], -delta[1]))
-    return [Pos(p.x + i * delta[0], p.y + i * delta[1]) for i in range(1, n + 1)]
 
+def tilt(rocks: Points, cubes: Points, d: Dir = Dir.N) -> Points:
+    """Return the rounded rocks rolled in the direction, lane by lane: the rocks between two
+    cube-shaped ones are counted by bisection, and stacked against one of them.
 
+    >>> print(*tilt(Points([(0, -1), (0, 3)]), Points([(0, 1), (0, 2)]), Dir.N))
+    (0, 0) (0, 1)
+    """
+    vert, rev = d in (Dir.N, Dir.S), d in (Dir.S, Dir.E)
+    lanes, moved = (cubes.cols if vert else cubes.rows), {}
+    for k, rs in (rocks.cols if vert else rocks.rows).items():
+        if not (cs := lanes.get(k)):
+            continue
+        lane, lo = [], 0
+        for r1, r2 in pairwise(rs):
+            hi = bisect.bisect(cs, r2, lo)
+            if n := hi - lo:
+                lane.extend(range(r2 - n, r2) if rev else range(r1 + 1, r1 + 1 + n))
+            lo = hi
+        moved[k] = lane
+    return Points.from_lanes(moved, vertical=vert)
+
+
+def loads(cubes: Points, size: int) -> list[int]:
+    """Return the number of rounded rocks of every row."""
+    return [len(cubes.rows.get(y, ())) for y in range(size)]
+
+
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[tuple[int, tuple[list[Pos], list[Pos]]]]:
     for y, line in enumerate(puzzle):
         rounded = [Pos(x, y) for x, c in enumerate(line.strip()) if c == "O"]
@@ -3,6 +3,8 @@ import functools
 from itertools import starmap
 from operator import mul
 
+from aoc import trace
+
 day = "15"  # https://adventofcode.com/2023/day/15
 
 example1 = "rn=1,cm-,qp=3,cm=2,qp-,pc=4,ot=9,ab=5,pc-,pc=6,ot=7"
@@ -56,6 +58,7 @@ def calc_hash(s: str) -> int:
     return functools.reduce(lambda n, c: (n + ord(c)) * 17 % 256, s, 0)
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> list[str]:  # pyright: ignore [reportReturnType]
     for line in puzzle:
         return line.strip().split(",")
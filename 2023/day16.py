@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import doctest
 import functools
+import operator
 from collections import deque, namedtuple
 from enum import Enum
 from typing import Iterator
 
+from aoc import bitset, engines, fanout, shared, tables, trace
+from aoc.bitset import BitGrid
+from aoc.shared import FlatGrid
+
 day = "16"  # https://adventofcode.com/2023/day/16
 
 example1 = r"""
@@ -28,39 +33,35 @@ Beam = namedtuple("Beam", "x y d")
 
 
 class Grid:
-    def __init__(self, iter: Iterator[list[Type]]) -> None:
-        self.grid = [tiles for tiles in iter]
+    def __init__(self, cells: FlatGrid) -> None:
+        self.cells = cells  # the tiles as bytes, shared by the workers of a pool
 
     def __contains__(self, pos: tuple[int, int]) -> bool:
         return 0 <= pos[0] < len(self) and 0 <= pos[1] < len(self)
 
     def __getitem__(self, pos: tuple[int, int]) -> Type:
-        return self.grid[pos[1]][pos[0]]
+        return TYPES[self.cells[pos]]
 
     def __iter__(self) -> Iterator[list[Type]]:
-        return iter(self.grid)
+        return ([TYPES[c] for c in self.cells.row(y)] for y in range(len(self)))
 
     def __len__(self) -> int:
-        return len(self.grid)
+        return self.cells.height
 
     @functools.cache
-    def slide(self, x: int, y: int, d: Dir) -> int:
-        if (x, y) not in self:
-            return 0
-        x2, y2 = x, y
-        while (x2, y2) in self and self.grid[y2][x2].slide(d):
-            x2, y2 = d.nex_pos(x2, y2)
-        return abs(x2 - x) + abs(y2 - y)
+    def slide(self, x: int, y: int, d: int) -> int:
+        (dx, dy), n = STEPS[d], 0
+        while (x, y) in self and SLIDES[self.cells[x, y] * 4 + d]:
+            x, y, n = x + dx, y + dy, n + 1
+        return n
 
 
 class Dir(Enum):
     U, D, L, R = range(4)
 
     def nex_pos(self, x: int, y: int, n: int = 1) -> tuple[int, int]:
-        return (
-            x + n * ((self == Dir.R) - (self == Dir.L)),
-            y + n * ((self == Dir.D) - (self == Dir.U)),
-        )
+        dx, dy = STEPS[self.value]
+        return x + n * dx, y + n * dy
 
 
 class Type(Enum):
@@ -73,56 +74,41 @@ class Type(Enum):
     def __repr__(self) -> str:
         return self.value
 
-    def beam(self, d: Dir) -> list[Dir]:  # pyright: ignore [reportReturnType]
-        if self == Type.EMPTY:
-            return [d]
-
-        if self == Type.MIRROR:
-            return [(Dir.R, Dir.L, Dir.D, Dir.U)[d.value]]
-
-        if self == Type.MIRROR_BACKSLASH:
-            return [(Dir.L, Dir.R, Dir.U, Dir.D)[d.value]]
-
-        if self == Type.SPLITTER_HORIZONTAL:
-            return ([Dir.L, Dir.R], [Dir.L, Dir.R], [Dir.L], [Dir.R])[d.value]
-
-        if self == Type.SPLITTER_VERTICAL:
-            return ([Dir.U], [Dir.D], [Dir.U, Dir.D], [Dir.U, Dir.D])[d.value]
-
-    def proj(self, d: Dir) -> tuple[bool, bool]:  # pyright: ignore [reportReturnType]
-        if self == Type.EMPTY:
-            return (True, False) if d in (Dir.U, Dir.D) else (False, True)
+    def beam(self, d: Dir) -> list[Dir]:
+        """Return the directions of the beams leaving the tile.
 
-        if self == Type.MIRROR:
-            return (True, False) if d in (Dir.U, Dir.L) else (False, True)
+        >>> Type.SPLITTER_VERTICAL.beam(Dir.R), Type.MIRROR.beam(Dir.U)
+        ([<Dir.U: 0>, <Dir.D: 1>], [<Dir.R: 3>])
+        """
+        return [Dir(e) for e in BEAMS[ord(self.value) * 4 + d.value]]
 
-        if self == Type.MIRROR_BACKSLASH:
-            return (True, False) if d in (Dir.U, Dir.R) else (False, True)
+    def proj(self, d: Dir) -> tuple[bool, bool]:
+        halves = HALVES[ord(self.value) * 4 + d.value]
+        return bool(halves & 1), bool(halves & 2)
 
-        if self == Type.SPLITTER_HORIZONTAL:
-            return (True, False) if d in (Dir.L, Dir.R) else (True, True)
+    def slide(self, d: Dir) -> bool:
+        return SLIDES[ord(self.value) * 4 + d.value]
 
-        if self == self == Type.SPLITTER_VERTICAL:
-            return (False, True) if d in (Dir.U, Dir.D) else (True, True)
-
-    def slide(self, d: Dir) -> bool:  # pyright: ignore [reportReturnType]
-        if self == Type.EMPTY:
-            return True
+    @classmethod
+    def from_str(cls, s: str) -> Type:
+        return TYPES[ord(s)]
 
-        if self == Type.MIRROR or self == Type.MIRROR_BACKSLASH:
-            return False
 
-        if self == Type.SPLITTER_HORIZONTAL:
-            return d in (Dir.L, Dir.R)
+TYPES = {ord(t.value): t for t in Type}
 
-        if self == self == Type.SPLITTER_VERTICAL:
-            return d in (Dir.U, Dir.D)
+# the tables of the beams, at `ord(tile) * 4 + d` for a beam moving in the direction `d`
+STEPS = tables.offsets("UDLR")
+TURNS = tables.transitions("UDLR", tables.MIRRORS)
+BEAMS = [tuple(bitset.indices(turns)) for turns in TURNS]
+SLIDES = [turns == 1 << (k % 4) for k, turns in enumerate(TURNS)]
 
-    @classmethod
-    def from_str(cls, s: str) -> Type:
-        return next(t for t in cls if s == t.value)
+# the halves of a tile a beam passes through, 1 and 2, for U, D, L and R
+HALVES = [0] * len(TURNS)
+for tile, halves in {".": "1122", "/": "1212", "\\": "1221", "-": "3311", "|": "2233"}.items():
+    HALVES[ord(tile) * 4 : ord(tile) * 4 + 4] = map(int, halves)
 
 
+@engines.dispatch
 def part_one(puzzle: list[str]) -> str:
     """Solve part one of the puzzle.
 
@@ -144,13 +130,16 @@ def part_one(puzzle: list[str]) -> str:
     >>> sum(c == "#" for l in part_one(open(f"2023/day{day}.in")) for c in l)
     7860
     """
-    result, grid = [], Grid(scan(puzzle))
-    seen = solve(grid, Beam(-1, 0, Dir.R))
+    with trace.span("build"):
+        result, grid = [], Grid(FlatGrid.from_lines(scan(puzzle)))
+    with trace.span("solve"):
+        seen = solve(grid, Beam(-1, 0, Dir.R))
     for y in range(len(grid)):
         result.append("".join("#" if (x, y) in seen else "." for x in range(len(grid))))
     return "\n".join(result)
 
 
+@engines.dispatch
 def part_two(puzzle: list[str]) -> tuple[int, Beam]:
     """Solve part two of the puzzle.
 
@@ -163,52 +152,62 @@ def part_two(puzzle: list[str]) -> tuple[int, Beam]:
     >>> part_two(open(f"2023/day{day}.in"))[0]
     8331
     """
-    grid, rs = Grid(scan(puzzle)), (0, None)
-    for (x, y), (dx, dy), d in [
-        ((0, -1), (1, 0), Dir.D),
-        ((-1, 0), (0, 1), Dir.R),
-        ((0, len(grid)), (1, 0), Dir.U),
-        ((len(grid), 0), (0, 1), Dir.L),
-    ]:
-        for i in range(len(grid)):
-            beam = Beam(x + i * dx, y + i * dy, d)
-            if (v := len(solve(grid, beam))) > rs[0]:
-                rs = (v, beam)
-    return rs  # pyright: ignore [reportReturnType]
-
-
-def solve(grid: Grid, beam: Beam) -> set[complex]:
-    seen, stack = (set(), set()), deque([beam])
+    with trace.span("build"):
+        grid = Grid(FlatGrid.from_lines(scan(puzzle)))
+    beams = [
+        Beam(x + i * dx, y + i * dy, d)
+        for (x, y), (dx, dy), d in [
+            ((0, -1), (1, 0), Dir.D),
+            ((-1, 0), (0, 1), Dir.R),
+            ((0, len(grid)), (1, 0), Dir.U),
+            ((len(grid), 0), (0, 1), Dir.L),
+        ]
+        for i in range(len(grid))
+    ]
+    best = functools.partial(max, key=operator.itemgetter(0), default=(0, None))
+    with shared.share(grid.cells) as cells:
+        return fanout.fanout(energized, Grid(cells), beams, reduce=best)  # type: ignore
+
+
+def energized(grid: Grid, beam: Beam) -> tuple[int, Beam]:
+    return len(solve(grid, beam)), beam
+
+
+def solve(grid: Grid, beam: Beam) -> BitGrid:
+    seen = (BitGrid(len(grid), len(grid)), BitGrid(len(grid), len(grid)))
+    stack = deque([(beam.x, beam.y, beam.d.value)])
     while stack:
-        beam = stack.pop()
-        x, y = beam.d.nex_pos(beam.x, beam.y)
-        if n := grid.slide(x, y, beam.d):  # sliding until hit
-            nx, ny = beam.d.nex_pos(x, y, n)
+        x, y, d = stack.pop()
+        dx, dy = STEPS[d]
+        x, y = x + dx, y + dy
+        if n := grid.slide(x, y, d):  # sliding until hit
+            nx, ny = x + n * dx, y + n * dy
             if ny == y:
-                seen[0].update((i, y) for i in range(x, nx, 1 if nx > x else -1))
+                seen[0].add_run(min(x, nx + 1), max(nx, x + 1), y)
             else:
-                seen[1].update((x, i) for i in range(y, ny, 1 if ny > y else -1))
+                seen[1].add_column_run(x, min(y, ny + 1), max(ny, y + 1))
             x, y = nx, ny
         if (x, y) not in grid:
             continue
-        (b1, b2) = grid[x, y].proj(beam.d)
-        if b1:
+        k = grid.cells[x, y] * 4 + d
+        if HALVES[k] & 1:
             if (x, y) in seen[0]:
                 continue
             seen[0].add((x, y))
-        if b2:
+        if HALVES[k] & 2:
             if (x, y) in seen[1]:
                 continue
             seen[1].add((x, y))
-        stack.extend(Beam(x, y, d) for d in grid[x, y].beam(beam.d))
-    return seen[0].union(seen[1])
+        stack.extend((x, y, e) for e in BEAMS[k])
+    return seen[0] | seen[1]
 
 
-def scan(puzzle: list[str]) -> Iterator[list[Type]]:
+@trace.traced
+def scan(puzzle: list[str]) -> Iterator[str]:
     for line in puzzle:
         if not (line := line.strip("\n")):
             continue
-        yield [Type.from_str(c) for c in line]
+        yield line
 
 
 def load_tests(loader, tests, ignore):
@@ -5,6 +5,8 @@ import heapq
 from enum import Enum
 from typing import Iterator
 
+from aoc import engines, tables, trace
+
 day = "17"  # https://adventofcode.com/2023/day/17
 
 example1 = """\
@@ -48,12 +50,15 @@ class Dir(Enum):
         return Dir((self.value - 1) % 4)
 
     def next_pos(self, x: int, y: int, n: int = 1) -> tuple[int, int]:
-        return (
-            x + n * ((self == Dir.R) - (self == Dir.L)),
-            y + n * ((self == Dir.D) - (self == Dir.U)),
-        )
+        dx, dy = STEPS[self.value]
+        return x + n * dx, y + n * dy
+
+
+STEPS = tables.offsets("URDL")
+TURNS = tuple(((d - 1) % 4, (d + 1) % 4) for d in range(4))  # counter-clockwise, clockwise
 
 
+@engines.dispatch
 def part_one(puzzle: list[str]) -> int:
     """Solve part one of the puzzle.
 
@@ -66,6 +71,7 @@ def part_one(puzzle: list[str]) -> int:
     return solve(list(scan(puzzle)))
 
 
+@engines.dispatch
 def part_two(puzzle: list[str]) -> int:
     """Solve part two of the puzzle.
 
@@ -82,7 +88,7 @@ def part_two(puzzle: list[str]) -> int:
 
 
 def solve(grid: list[list[int]], /, *, min: int = 1, max: int = 3) -> int:  # type: ignore
-    pq, seen = [(0, 0, 0, Dir.R), (0, 0, 0, Dir.D)], set()
+    pq, seen = [(0, 0, 0, Dir.R.value), (0, 0, 0, Dir.D.value)], set()
     while pq:
         n, x, y, d = heapq.heappop(pq)
         if x == len(grid[0]) - 1 and y == len(grid) - 1:
@@ -90,17 +96,18 @@ def solve(grid: list[list[int]], /, *, min: int = 1, max: int = 3) -> int:  # ty
         if (x, y, d) in seen:
             continue
         seen.add((x, y, d))
-        for d in [d.counter_clockwise(), d.clockwise()]:
-            costs = []
+        for d in TURNS[d]:
+            (dx, dy), cost, nx, ny = STEPS[d], n, x, y
             for i in range(1, max + 1):
-                nx, ny = d.next_pos(x, y, i)
+                nx, ny = nx + dx, ny + dy
                 if nx < 0 or ny < 0 or nx >= len(grid[0]) or ny >= len(grid):
                     break
-                costs.append(grid[ny][nx])
+                cost += grid[ny][nx]
                 if i >= min:
-                    heapq.heappush(pq, (n + sum(costs), nx, ny, d))
+                    heapq.heappush(pq, (cost, nx, ny, d))
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[list[int]]:
     for line in puzzle:
         yield [int(c) for c in line.strip("\n")]
@@ -5,6 +5,8 @@ import operator
 from enum import Enum
 from typing import Iterator
 
+from aoc import tables, trace
+
 day = "18"  # https://adventofcode.com/2023/day/18
 
 example1 = """\
@@ -32,10 +34,11 @@ class Dir(Enum):
     R, D, L, U = range(4)
 
     def next_pos(self, x: int, y: int, n: int = 1) -> tuple[int, int]:
-        return (
-            x + n * ((self == Dir.R) - (self == Dir.L)),
-            y + n * ((self == Dir.D) - (self == Dir.U)),
-        )
+        dx, dy = STEPS[self.value]
+        return x + n * dx, y + n * dy
+
+
+STEPS = tables.offsets("RDLU")
 
 
 def part_one(puzzle: list[str]) -> tuple[int, int]:
@@ -73,19 +76,18 @@ def solve(plan: map[tuple[Dir, int]]) -> tuple[int, int]:
     # https://en.wikipedia.org/wiki/Shoelace_formula
     x, y, a, b = 0, 0, 0, 0
     for d, l in plan:
-        dx, dy = d.next_pos(0, 0, l)
+        dx, dy = STEPS[d.value]
+        dx, dy = dx * l, dy * l
         x, y = x + dx, y + dy
         a, b = a + x * dy, b + l
     return a - b // 2 + 1, b
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[tuple[tuple[Dir, int], tuple[Dir, int]]]:
     for line in puzzle:
-        entries = line.strip("\n").split()
-        yield (Dir[entries[0]], int(entries[1])), (
-            Dir(int(entries[2][7])),
-            int(entries[2][2:7], 16),
-        )
+        d, n, code = line.split()  # fixed format, faster than a pattern
+        yield (Dir[d], int(n)), (Dir(int(code[7])), int(code[2:7], 16))
 
 
 def load_tests(loader, tests, ignore):
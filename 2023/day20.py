@@ -7,6 +7,9 @@ from abc import abstractmethod
 from itertools import chain
 from typing import Callable, Iterable, Iterator, cast
 
+from aoc import engines, trace
+from aoc.checkpoint import Checkpoint
+
 day = "20"  # https://adventofcode.com/2023/day/20
 
 example11 = """\
@@ -76,9 +79,15 @@ class Inverter(Module):
         return ((rx, v) for rx in self._dest)
 
 
-def part_one(puzzle: list[str], n: int = 1_000) -> tuple[int, int]:
+@engines.dispatch
+def part_one(
+    puzzle: list[str], n: int = 1_000, checkpoint: Checkpoint | None = None
+) -> tuple[int, int]:
     """Solve part one of the puzzle.
 
+    With a checkpoint, the button presses done, the pulse counts and the `snapshot` of the
+    modules are saved as it goes, and resumed from.
+
     >>> part_one(example11.splitlines())
     (8000, 4000)
 
@@ -94,33 +103,62 @@ def part_one(puzzle: list[str], n: int = 1_000) -> tuple[int, int]:
 
     >>> math.prod(part_one(open(f"2023/day{day}.in")))
     680278040
+
+    >>> import os, tempfile
+    >>> tmp = tempfile.TemporaryDirectory()
+    >>> cp = Checkpoint(os.path.join(tmp.name, "day20"), interval=0)
+    >>> cp.save((999, [4246, 2748], (0b1, {"inv": ["a"], "con": ["a"]})))
+    >>> part_one(example12.splitlines(), checkpoint=cp), cp.load()
+    ((4250, 2750), None)
+    >>> tmp.cleanup()
     """
-    modules, rs = dict(scan(puzzle)), [0, 0]
-    for d in chain.from_iterable(m._dest for m in modules.values()):
-        if d in modules and isinstance(modules[d], Inverter):
-            cast(Inverter, modules[d]).inputs += 1
-    for _ in range(n):
-        cycle(modules, lambda _, hp: operator.setitem(rs, hp, rs[hp] + 1))
+    modules, rs, start = build(puzzle), [0, 0], 0
+    if checkpoint and (state := checkpoint.load()):
+        start, rs, modules_state = state
+        restore(modules, modules_state)
+    with trace.span("solve"):
+        for i in range(start, n):
+            cycle(modules, lambda _, hp: operator.setitem(rs, hp, rs[hp] + 1))
+            if checkpoint:
+                checkpoint.tick(lambda: (i + 1, rs, snapshot(modules)))
+    if checkpoint:
+        checkpoint.clear()
     return cast(tuple[int, int], tuple(rs))
 
 
-def part_two(puzzle: list[str]) -> tuple[int, int, int, int]:
-    """Solve part two of the puzzle.
+@engines.dispatch
+def part_two(puzzle: list[str], checkpoint: Checkpoint | None = None) -> tuple[int, int, int, int]:
+    """Solve part two of the puzzle, resuming from the checkpoint as part one does.
 
     >>> import math
     >>> math.lcm(*part_two(open(f"2023/day{day}.in")))
     243548140870057
     """
-    modules, rs = dict(scan(puzzle)), []
+    modules, rs, start = build(puzzle), [], 1
+    if checkpoint and (state := checkpoint.load()):
+        start, rs, modules_state = state
+        restore(modules, modules_state)
+    with trace.span("solve"):
+        for i in itertools.count(start):
+            if len(rs) == 4:
+                break
+            # 'vf' is just invertor before `rx`
+            cycle(modules, lambda rx, hp: rs.append(i) if rx == "vf" and hp else None)
+            if checkpoint:
+                checkpoint.tick(lambda: (i + 1, rs, snapshot(modules)))
+    if checkpoint:
+        checkpoint.clear()
+    return tuple(rs)
+
+
+@trace.traced
+def build(puzzle: list[str]) -> dict[str, Module]:
+    """Return the modules by name, the inverters knowing how many inputs they have."""
+    modules = dict(scan(puzzle))
     for d in chain.from_iterable(m._dest for m in modules.values()):
         if d in modules and isinstance(modules[d], Inverter):
             cast(Inverter, modules[d]).inputs += 1
-    for i in itertools.count(1):
-        if len(rs) == 4:
-            break
-        # 'vf' is just invertor before `rx`
-        cycle(modules, lambda rx, hp: rs.append(i) if rx == "vf" and hp else None)
-    return tuple(rs)
+    return modules
 
 
 def cycle(modules: dict[str, Module], fn: Callable[[str, bool], None]) -> None:
@@ -134,6 +172,38 @@ def cycle(modules: dict[str, Module], fn: Callable[[str, bool], None]) -> None:
             q.append(Pulse(rx, rx2, hp2))
 
 
+def snapshot(modules: dict[str, Module]) -> tuple[int, dict[str, list[str]]]:
+    """Return the states of the modules, as the bits of the flip-flops in the order of their
+    names and the inputs of every inverter which last pulse was high.
+
+    >>> modules = dict(scan(example12.splitlines()))
+    >>> cycle(modules, lambda rx, hp: None)
+    >>> snapshot(modules)
+    (1, {'inv': ['a'], 'con': ['a']})
+
+    >>> restore(modules, (0, {"inv": ["a"], "con": []}))
+    >>> snapshot(modules)
+    (0, {'inv': ['a'], 'con': []})
+    """
+    flip_flops = sorted(k for k, m in modules.items() if isinstance(m, FlipFlop))
+    bits = sum(1 << i for i, k in enumerate(flip_flops) if cast(FlipFlop, modules[k])._state)
+    return bits, {
+        k: sorted(tx for tx, hp in m._state.items() if hp)
+        for k, m in modules.items()
+        if isinstance(m, Inverter)
+    }
+
+
+def restore(modules: dict[str, Module], state: tuple[int, dict[str, list[str]]]) -> None:
+    bits, highs = state
+    flip_flops = sorted(k for k, m in modules.items() if isinstance(m, FlipFlop))
+    for i, k in enumerate(flip_flops):
+        cast(FlipFlop, modules[k])._state = bits >> i & 1 == 1
+    for k, txs in highs.items():
+        cast(Inverter, modules[k])._state = collections.defaultdict(bool, dict.fromkeys(txs, True))
+
+
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[tuple[str, Module]]:
     for line in puzzle:
         src, dest = line.strip("\n").split(" -> ")
@@ -1,6 +1,9 @@
 import doctest
 from typing import Iterator
 
+from aoc import trace
+from aoc.bitset import BitGrid
+
 day = "21"  # https://adventofcode.com/2023/day/21
 
 example1 = """\
@@ -21,11 +24,11 @@ example1 = """\
 example2 = example1
 
 
-def part_one(puzzle: list[str], n: int = 64) -> list[int]:
+def part_one(puzzle: list[str], n: int = 64) -> list[tuple[int, int]]:
     """Solve part one of the puzzle.
 
-    >> import pprint
-    >> pprint.pprint(part_one(example1.splitlines(), n=6))
+    >>> import pprint
+    >>> pprint.pprint(part_one(example1.splitlines(), n=6))
     [(2, 8),
      (3, 1),
      (3, 3),
@@ -43,13 +46,21 @@ def part_one(puzzle: list[str], n: int = 64) -> list[int]:
      (7, 5),
      (9, 3)]
 
-    >> sum(part_one(example1.splitlines()))
+    >>> len(part_one(example1.splitlines(), n=6))
     16
 
-    >> sum(part_one(open(f"2023/day{day}.in")))
-    ???
+    >>> len(part_one(open(f"2023/day{day}.in")))
+    3639
     """
-    return []
+    lines = list(scan(puzzle))
+    plots = BitGrid.from_lines([line.replace("S", ".") for line in lines], on=".")
+    reached = BitGrid(plots.width, plots.height)
+    for y, line in enumerate(lines):
+        if "S" in line:
+            reached.add((line.index("S"), y))
+    for _ in range(n):  # the frontier of all the steps taken at once
+        reached = reached.spread() & plots
+    return sorted((y, x) for x, y in reached)  # as (row, column) pairs
 
 
 def part_two(puzzle: list[str]) -> list[int]:
@@ -67,6 +78,7 @@ def part_two(puzzle: list[str]) -> list[int]:
     return []
 
 
+@trace.traced
 def scan(puzzle: list[str]) -> Iterator[str]:
     for line in puzzle:
         yield line.strip("\n")
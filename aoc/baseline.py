@@ -0,0 +1,100 @@
+import doctest
+import json
+import os
+from typing import Any
+
+from aoc import days
+
+
+def path(year: str = days.year) -> str:
+    return f"{year}/baseline.json"
+
+
+def cache(name: str, env: str) -> str:
+    """Return the file of the name in the cache directory of the user, unless the environment
+    variable names another one.
+
+    >>> import unittest.mock
+    >>> with unittest.mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/c", "AOC_TIMINGS": ""}):
+    ...     cache("timings.json", "AOC_TIMINGS")
+    '/c/aoc/timings.json'
+    """
+    if file := os.environ.get(env):
+        return file
+    home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(home, "aoc", name)
+
+
+def read(file: str, key: str) -> dict[str, Any]:
+    """Return the entry of the key in a json file of entries, empty if there is none."""
+    if not os.path.exists(file):
+        return {}
+    with open(file) as f:
+        return json.load(f).get(key, {})
+
+
+def update(file: str, key: str, values: dict[str, Any]) -> None:
+    """Merge the values into the entry of the key in a json file of entries, made if missing.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     update(os.path.join(tmp, "aoc", "runs.json"), "a", {"12/2": 1.5})
+    ...     update(os.path.join(tmp, "aoc", "runs.json"), "a", {"12/1": 0.5})
+    ...     read(os.path.join(tmp, "aoc", "runs.json"), "a")
+    {'12/1': 0.5, '12/2': 1.5}
+    """
+    data = {}
+    if os.path.exists(file):
+        with open(file) as f:
+            data = json.load(f)
+    data.setdefault(key, {}).update(values)
+    os.makedirs(os.path.dirname(file) or ".", exist_ok=True)
+    with open(file, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(section: str, year: str = days.year) -> dict[str, float]:
+    """Return the recorded values of the section, empty if nothing was recorded."""
+    return read(path(year), section)
+
+
+def save(section: str, values: dict[str, float], year: str = days.year) -> None:
+    """Merge the values into the section of the baseline file."""
+    update(path(year), section, values)
+
+
+def compare(
+    recorded: dict[str, float],
+    measured: dict[str, float],
+    tolerance: float | dict[str, float],
+    relative: bool = False,
+) -> dict[str, tuple[float, float]]:
+    """Return the measured values worse than recorded by more than the tolerance, an amount
+    or a fraction of the recorded value, the same for all or by key.
+
+    >>> compare({"01/1": 1.0, "02/1": 1.0}, {"01/1": 1.1, "02/1": 1.5, "03/1": 9.0}, 0.25)
+    {'02/1': (1.0, 1.5)}
+
+    >>> compare({"15/calc_hash": 400.0}, {"15/calc_hash": 480.0}, 0.25, relative=True)
+    {}
+
+    >>> compare({"15/calc_hash": 400.0}, {"15/calc_hash": 480.0}, {"15/calc_hash": 0.1}, True)
+    {'15/calc_hash': (400.0, 480.0)}
+    """
+    tolerances = tolerance if isinstance(tolerance, dict) else dict.fromkeys(measured, tolerance)
+    return {
+        k: (recorded[k], v)
+        for k, v in measured.items()
+        if k in recorded
+        and v > (recorded[k] * (1 + tolerances[k]) if relative else recorded[k] + tolerances[k])
+    }
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,164 @@
+"""Sets of small non-negative integers and of grid cells held in the bits of Python ints.
+
+Union, intersection and counting run over whole machine words in C, instead of hashing one
+element at a time as `set` does.
+"""
+
+from __future__ import annotations
+
+import doctest
+import functools
+import re
+from typing import Iterable, Iterator
+
+
+def from_indices(indices: Iterable[int]) -> int:
+    """Return the bitset of the indices.
+
+    >>> bin(from_indices([0, 3, 4]))
+    '0b11001'
+
+    >>> (from_indices([41, 48, 83, 86, 17]) & from_indices([83, 86, 6, 31, 17, 9])).bit_count()
+    3
+    """
+    bits = 0
+    for i in indices:
+        bits |= 1 << i
+    return bits
+
+
+def from_str(s: str, on: str = "#") -> int:
+    """Return the bitset of the positions of the `on` character in the string.
+
+    >>> bin(from_str("#.##..#"))
+    '0b1001101'
+    """
+    return int(others(on).sub("0", s[::-1]).replace(on, "1") or "0", 2)
+
+
+@functools.cache
+def others(on: str) -> re.Pattern[str]:
+    return re.compile(f"[^{re.escape(on)}]")
+
+
+def indices(bits: int) -> Iterator[int]:
+    """Return the indices of the bitset, in increasing order.
+
+    >>> list(indices(0b1001101))
+    [0, 2, 3, 6]
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def mask(start: int, stop: int) -> int:
+    """Return the bitset of the range of indices.
+
+    >>> bin(mask(2, 5))
+    '0b11100'
+    """
+    return ((1 << (stop - start)) - 1) << start if stop > start else 0
+
+
+class BitGrid:
+    """A set of cells of a `width` by `height` grid, one int of bits for every row.
+
+    >>> grid = BitGrid.from_lines(["#..", ".#.", "..#"])
+    >>> (1, 1) in grid, (0, 1) in grid, len(grid)
+    (True, False, 3)
+
+    >>> grid.add_run(0, 3, 0)
+    >>> grid.add_column_run(2, 0, 3)
+    >>> print(grid)
+    ###
+    .##
+    ..#
+
+    >>> bin(grid.row(0)), bin(grid.column(2))
+    ('0b111', '0b111')
+
+    >>> print(grid.spread())
+    ###
+    ###
+    .##
+    """
+
+    __slots__ = ("rows", "width", "height")
+
+    def __init__(self, width: int, height: int, rows: list[int] | None = None) -> None:
+        self.width, self.height = width, height
+        self.rows = [0] * height if rows is None else rows
+
+    @classmethod
+    def from_lines(cls, lines: list[str], on: str = "#") -> BitGrid:
+        width = max(map(len, lines), default=0)
+        return cls(width, len(lines), [from_str(line, on) for line in lines])
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        x, y = pos
+        return 0 <= y < self.height and 0 <= x and self.rows[y] >> x & 1 == 1
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for y, row in enumerate(self.rows):
+            for x in indices(row):
+                yield x, y
+
+    def __len__(self) -> int:
+        return sum(row.bit_count() for row in self.rows)
+
+    def __or__(self, other: BitGrid) -> BitGrid:
+        return BitGrid(self.width, self.height, [a | b for a, b in zip(self.rows, other.rows)])
+
+    def __and__(self, other: BitGrid) -> BitGrid:
+        return BitGrid(self.width, self.height, [a & b for a, b in zip(self.rows, other.rows)])
+
+    def __str__(self) -> str:
+        return "\n".join(
+            "".join("#" if row >> x & 1 else "." for x in range(self.width)) for row in self.rows
+        )
+
+    def add(self, pos: tuple[int, int]) -> None:
+        self.rows[pos[1]] |= 1 << pos[0]
+
+    def add_run(self, x1: int, x2: int, y: int) -> None:
+        """Add the cells from `x1` up to, but excluding, `x2` of the row `y`."""
+        self.rows[y] |= mask(x1, x2)
+
+    def add_column_run(self, x: int, y1: int, y2: int) -> None:
+        """Add the cells from `y1` up to, but excluding, `y2` of the column `x`."""
+        bit = 1 << x
+        for y in range(y1, y2):
+            self.rows[y] |= bit
+
+    def row(self, y: int) -> int:
+        return self.rows[y]
+
+    def column(self, x: int) -> int:
+        """Return the bitset of the column, the bit `y` being the cell of the row `y`."""
+        return from_indices(y for y, row in enumerate(self.rows) if row >> x & 1)
+
+    def transpose(self) -> BitGrid:
+        return BitGrid(self.height, self.width, [self.column(x) for x in range(self.width)])
+
+    def spread(self) -> BitGrid:
+        """Return the cells next to the cells of the set, up, down, left or right."""
+        full, rows = mask(0, self.width), [0] + self.rows + [0]
+        return BitGrid(
+            self.width,
+            self.height,
+            [
+                (rows[y + 1] << 1 | rows[y + 1] >> 1 | rows[y] | rows[y + 2]) & full
+                for y in range(self.height)
+            ],
+        )
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,77 @@
+"""Snapshots of long running simulations, to resume them after a restart.
+
+A simulation loads the last snapshot when it starts, calls `tick` as it goes, which saves a
+new snapshot once `interval` seconds have passed, and clears it when it is done. A snapshot
+belongs to a single input and parameters, the caller picks a path for every one.
+"""
+
+from __future__ import annotations
+
+import doctest
+import os
+import pickle
+import time
+from typing import Any, Callable
+
+
+class Checkpoint:
+    """A snapshot file saved at most every `interval` seconds.
+
+    >>> import tempfile
+    >>> tmp = tempfile.TemporaryDirectory()
+    >>> cp = Checkpoint(os.path.join(tmp.name, "count.pickle"), interval=0)
+    >>> def count(n, cp, stop=None):
+    ...     i, total = cp.load() or (0, 0)
+    ...     while i < n:
+    ...         if i == stop:
+    ...             raise RuntimeError("worker restarted")
+    ...         i, total = i + 1, total + i
+    ...         cp.tick(lambda: (i, total))
+    ...     cp.clear()
+    ...     return total
+    >>> count(100, cp, stop=60)
+    Traceback (most recent call last):
+    ...
+    RuntimeError: worker restarted
+    >>> cp.load()
+    (60, 1770)
+    >>> count(100, cp), cp.load()
+    (4950, None)
+    >>> tmp.cleanup()
+    """
+
+    def __init__(self, path: str, interval: float = 60.0) -> None:
+        self.path, self.interval = path, interval
+        self._saved = time.monotonic()
+
+    def load(self) -> Any:
+        """Return the last saved state, or None if there is none."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            return pickle.load(f)
+
+    def save(self, state: Any) -> None:
+        """Write the state next to the snapshot and swap them, so a crash keeps the old one."""
+        with open(f"{self.path}.tmp", "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{self.path}.tmp", self.path)
+        self._saved = time.monotonic()
+
+    def tick(self, state: Callable[[], Any]) -> None:
+        """Save the state returned by the callable, if the interval has passed."""
+        if time.monotonic() - self._saved >= self.interval:
+            self.save(state())
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
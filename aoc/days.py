@@ -0,0 +1,63 @@
+import doctest
+import glob
+import importlib
+import os
+from types import ModuleType
+from typing import Any
+
+from aoc import inputs, sampling, trace
+
+year = "2023"
+
+parts = ("part_one", "part_two")
+
+
+def names(year: str = year) -> list[str]:
+    """Return the numbers of the days solved for the year.
+
+    >>> names()[:3]
+    ['01', '02', '03']
+    """
+    return sorted(os.path.basename(p)[3:5] for p in glob.glob(f"{year}/day[0-9][0-9].py"))
+
+
+def load(day: str, year: str = year) -> ModuleType:
+    """Import the module of the day.
+
+    >>> load("01").day
+    '01'
+    """
+    return importlib.import_module(f"{year}.day{day}")
+
+
+def path(day: str, year: str = year) -> str:
+    """Return the path of the input of the day, which may be stored compressed."""
+    return inputs.find(f"{year}/day{day}.in")
+
+
+def read(day: str, year: str = year) -> list[str]:
+    with inputs.open_input(path(day, year)) as f, trace.span("read"):
+        return f.readlines()
+
+
+def run(day: str, part: int, puzzle: list[str], year: str = year) -> Any:
+    """Solve the part of the day for the puzzle.
+
+    >>> run("01", 1, ["1abc2", "a1b2c3d4e5f"])
+    [12, 15]
+
+    >>> sum(run("04", 2, read("04")))
+    5667240
+    """
+    fn = getattr(load(day, year), parts[part - 1])
+    with sampling.sampled(f"{day}/{part}"), trace.span(f"{day}/{part}", cat="part"):
+        return fn(puzzle)
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
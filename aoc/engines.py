@@ -0,0 +1,160 @@
+"""Named implementations (engines) behind the parts of the days.
+
+The decorated part is the `reference` engine, faster ones are registered next to it::
+
+    @engines.dispatch
+    def part_two(puzzle: list[str]) -> int:
+        ...
+
+    @part_two.register("fast")
+    def part_two_fast(puzzle: list[str]) -> int:
+        ...
+
+An engine is picked per call (`part_two(puzzle, engine="fast")`) or by the environment, as
+`AOC_ENGINE=fast` for every part that has it, or `AOC_ENGINE=12=fast,16/2=numpy` for some days
+or parts only. With `AOC_VERIFY=reference` (or any other engine) the picked engine is checked
+against that one on every call.
+"""
+
+from __future__ import annotations
+
+import doctest
+import functools
+import os
+import warnings
+from typing import Any, Callable, Protocol, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+reference = "reference"
+
+
+class Mismatch(AssertionError):
+    """Two engines gave different answers for the same puzzle."""
+
+
+class Dispatcher(Protocol):
+    day: str
+    part: int
+    engines: dict[str, Callable[..., Any]]
+
+    def __call__(
+        self, puzzle: Any, *args: Any, engine: str | None = None, **kwargs: Any
+    ) -> Any: ...
+
+    def register(self, name: str) -> Callable[[F], F]: ...
+
+
+def dispatch(fn: Callable[..., Any]) -> Dispatcher:
+    """Make the part the reference engine and dispatch its calls to the selected engine.
+
+    >>> @dispatch
+    ... def part_one(puzzle, n=1):
+    ...     return sum(map(int, puzzle)) * n
+    >>> @part_one.register("fast")
+    ... def _(puzzle, n=1):
+    ...     return n * sum(int(line) for line in puzzle)
+    >>> sorted(part_one.engines)
+    ['fast', 'reference']
+
+    >>> part_one(["1", "2"]), part_one(["1", "2"], 2, engine="fast")
+    (3, 6)
+
+    >>> part_one(["1"], engine="numpy")
+    Traceback (most recent call last):
+    ...
+    KeyError: "no engine 'numpy' for part 1, only ['fast', 'reference']"
+    """
+    engines: dict[str, Callable[..., Any]] = {reference: fn}
+    day = fn.__module__.rpartition(".")[2].removeprefix("day")
+    part = 1 if fn.__name__ == "part_one" else 2
+
+    @functools.wraps(fn)
+    def wrapper(puzzle: Any, *args: Any, engine: str | None = None, **kwargs: Any) -> Any:
+        name = engine or selected(day, part, engines)
+        if name not in engines:
+            raise KeyError(f"no engine {name!r} for part {part}, only {sorted(engines)}")
+        if (oracle := os.environ.get("AOC_VERIFY")) not in engines or oracle == name:
+            return engines[name](puzzle, *args, **kwargs)
+        if not isinstance(puzzle, (str, bytes)):
+            puzzle = list(puzzle)  # read once, solved twice
+        return verify(engines[name], engines[oracle], puzzle, *args, **kwargs)
+
+    def register(name: str) -> Callable[[F], F]:
+        def decorator(impl: F) -> F:
+            engines[name] = impl
+            return impl
+
+        return decorator
+
+    wrapper.day, wrapper.part = day, part  # type: ignore
+    wrapper.engines, wrapper.register = engines, register  # type: ignore
+    return cast(Dispatcher, wrapper)
+
+
+def selected(day: str, part: int, engines: dict[str, Callable[..., Any]]) -> str:
+    """Return the engine of the part set by `AOC_ENGINE`, the most specific entry first.
+
+    An entry of the day or of the part naming none of its engines, as a typo, is warned about
+    and passed for the next one; the global entry only applies to the parts that have it.
+
+    >>> from unittest.mock import patch
+    >>> engines = dict.fromkeys(["reference", "fast", "table"])
+    >>> with patch.dict(os.environ, AOC_ENGINE="fast,12=table,12/2=fast"):
+    ...     selected("12", 1, engines), selected("12", 2, engines), selected("16", 1, engines)
+    ('table', 'fast', 'fast')
+
+    >>> with patch.dict(os.environ, AOC_ENGINE="numpy"):
+    ...     selected("16", 1, engines)
+    'reference'
+
+    >>> import warnings
+    >>> with patch.dict(os.environ, AOC_ENGINE="12=table,12/2=tabel"):
+    ...     with warnings.catch_warnings(record=True) as caught:
+    ...         selected("12", 2, engines), str(caught[0].message)
+    ('table', "AOC_ENGINE names no engine 'tabel' for 12/2, only ['fast', 'reference', 'table']")
+
+    >>> with patch.dict(os.environ, AOC_ENGINE=""):
+    ...     selected("12", 1, engines)
+    'reference'
+    """
+    entries = {}
+    for entry in filter(None, os.environ.get("AOC_ENGINE", "").split(",")):
+        key, _, name = entry.rpartition("=")
+        entries[key] = name
+    for key in (f"{day}/{part}", day):
+        if key not in entries:
+            continue
+        if entries[key] in engines:
+            return entries[key]
+        warnings.warn(
+            f"AOC_ENGINE names no engine {entries[key]!r} for {key}, only {sorted(engines)}"
+        )
+    return entries[""] if entries.get("") in engines else reference
+
+
+def verify(engine: Callable[..., Any], oracle: Callable[..., Any], puzzle: Any, *args, **kwargs):
+    """Return the answer of the engine, checked against the answer of the oracle.
+
+    >>> verify(sum, lambda xs: sum(sorted(xs)), [3, 1, 2])
+    6
+
+    >>> try:
+    ...     verify(max, min, [3, 1, 2])
+    ... except Mismatch as e:
+    ...     print(e)
+    max gave 3, min gave 1
+    """
+    answer, expected = engine(puzzle, *args, **kwargs), oracle(puzzle, *args, **kwargs)
+    if answer != expected:
+        raise Mismatch(f"{engine.__name__} gave {answer!r}, {oracle.__name__} gave {expected!r}")
+    return answer
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,100 @@
+"""Fan-out of the independent searches of a single input over a pool of processes.
+
+The parsed structure the searches share is sent once to every worker, not once per search,
+and the results come back in the order of the jobs, for the caller to reduce::
+
+    best = fanout.fanout(energized, grid, beams, reduce=max)
+
+`AOC_WORKERS` sets the number of processes, the default of 1 runs the searches in-process.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import doctest
+import functools
+import math
+import os
+from typing import Any, Callable, Iterable, TypeVar
+
+from aoc import trace
+
+J = TypeVar("J")
+R = TypeVar("R")
+S = TypeVar("S")
+T = TypeVar("T")
+
+_shared: Any = None  # the structure of the searches, in a worker
+
+
+def workers() -> int:
+    """Return the number of processes set by `AOC_WORKERS`.
+
+    >>> from unittest.mock import patch
+    >>> with patch.dict(os.environ, AOC_WORKERS="4"):
+    ...     workers()
+    4
+
+    >>> with patch.dict(os.environ):
+    ...     _ = os.environ.pop("AOC_WORKERS", None)
+    ...     workers()
+    1
+    """
+    return max(1, int(os.environ.get("AOC_WORKERS", 1)))
+
+
+def fanout(
+    fn: Callable[[S, J], R],
+    shared: S,
+    jobs: Iterable[J],
+    reduce: Callable[[Iterable[R]], T],
+    n: int | None = None,
+) -> T:
+    """Return the results of `fn(shared, job)` for every job, reduced, on `n` processes.
+
+    The function must be defined at the top level of a module, to be sent to the workers.
+
+    >>> fanout(pow, 2, range(10), reduce=sum, n=2), sum(pow(2, i) for i in range(10))
+    (1023, 1023)
+
+    >>> fanout(math.gcd, 12, [8, 18, 9], reduce=lambda rs: math.lcm(*rs), n=1)
+    12
+    """
+    n = n or workers()
+    if n == 1:
+        with trace.span("fanout", workers=1):
+            return reduce(fn(shared, job) for job in jobs)
+    jobs = list(jobs)
+    with trace.span("fanout", jobs=len(jobs), workers=n), concurrent.futures.ProcessPoolExecutor(
+        min(n, len(jobs)) or 1, initializer=_init, initargs=(shared,)
+    ) as pool:
+        chunksize = max(1, len(jobs) // (4 * n))
+        if not trace.enabled:
+            return reduce(pool.map(functools.partial(_call, fn), jobs, chunksize=chunksize))
+        results = pool.map(functools.partial(_traced_call, fn), jobs, chunksize=chunksize)
+        return reduce(trace.merged(results))
+
+
+def _init(shared: Any) -> None:
+    global _shared
+    _shared, _ = shared, trace.drain()  # the events of the parent are its own
+    trace.name_process("fanout worker")
+
+
+def _call(fn: Callable[[Any, J], R], job: J) -> R:
+    return fn(_shared, job)
+
+
+def _traced_call(fn: Callable[[Any, J], R], job: J) -> tuple[R, list[dict[str, Any]]]:
+    with trace.span(fn.__name__, cat="job"):
+        result = fn(_shared, job)
+    return result, trace.drain()
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
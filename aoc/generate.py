@@ -0,0 +1,244 @@
+"""Generators of synthetic puzzle inputs of a given relative size.
+
+The size `n` scales the input linearly: twice the `n` gives twice the lines for line based
+puzzles and twice the cells for grid based ones.
+"""
+
+import doctest
+import math
+import random
+import string
+from typing import Callable
+
+ALPHA, DIGITS = string.ascii_uppercase, string.digits
+
+Generator = Callable[[random.Random, int], list[str]]
+
+generators: dict[str, Generator] = {}
+
+
+def generator(day: str) -> Callable[[Generator], Generator]:
+    def register(fn: Generator) -> Generator:
+        generators[day] = fn
+        return fn
+
+    return register
+
+
+def generate(day: str, n: int, seed: int = 0) -> list[str]:
+    """Generate the input of the day of the relative size `n`.
+
+    >>> from aoc import days
+    >>> sum(days.run("01", 1, generate("01", 1))) == sum(days.run("01", 1, generate("01", 1)))
+    True
+
+    >>> len(generate("02", 4)) == 4 * len(generate("02", 1))
+    True
+    """
+    return generators[day](random.Random(seed), n)
+
+
+def side(n: int, base: int) -> int:
+    """Return the side of a square grid which area is `n` times the `base` squared."""
+    return round(base * math.sqrt(n))
+
+
+@generator("01")
+def day01(rng: random.Random, n: int) -> list[str]:
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    lines = []
+    for _ in range(100 * n):
+        parts = [rng.choice([rng.choice(words), str(rng.randint(1, 9))]) for _ in range(4)]
+        parts.insert(rng.randint(0, 4), str(rng.randint(1, 9)))
+        lines.append("".join(p + "".join(rng.choices("abcxyz", k=2)) for p in parts) + "\n")
+    return lines
+
+
+@generator("02")
+def day02(rng: random.Random, n: int) -> list[str]:
+    lines = []
+    for i in range(1, 100 * n + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+        lines.append(f"Game {i}: {'; '.join(draws)}\n")
+    return lines
+
+
+@generator("03")
+def day03(rng: random.Random, n: int) -> list[str]:
+    lines, size = [], side(n, 40)
+    for _ in range(size):
+        line = ""
+        while len(line) < size:
+            line += rng.choice(["...", "..", str(rng.randint(1, 999)), rng.choice("*#+$")])
+        lines.append(line[:size] + "\n")
+    return lines
+
+
+@generator("04")
+def day04(rng: random.Random, n: int) -> list[str]:
+    lines, count = [], 100 * n
+    for i in range(1, count + 1):  # no card wins copies of cards past the end of the table
+        numbers = rng.sample(range(1, 100), 35)
+        matches = rng.randint(0, min(5, count - i))
+        have = rng.sample(numbers[:matches] + numbers[10:], 25)
+        ws, hs = (" ".join(f"{v:2}" for v in vs) for vs in (numbers[:10], have))
+        lines.append(f"Card {i:3}: {ws} | {hs}\n")
+    return lines
+
+
+@generator("05")
+def day05(rng: random.Random, n: int) -> list[str]:
+    seeds = [rng.randrange(2**32) for _ in range(20 * n)]
+    lines = [f"seeds: {' '.join(map(str, seeds))}\n"]
+    for name in ["seed-to-soil", "soil-to-fertilizer", "fertilizer-to-water", "water-to-light"]:
+        lines.extend(["\n", f"{name} map:\n"])
+        bounds = sorted(rng.sample(range(2**32), 10 * n + 1))
+        for lo, hi in zip(bounds, bounds[1:]):
+            lines.append(f"{rng.randrange(2**32 - (hi - lo))} {lo} {hi - lo}\n")
+    return lines
+
+
+@generator("07")
+def day07(rng: random.Random, n: int) -> list[str]:
+    return [
+        f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 999)}\n"
+        for _ in range(100 * n)
+    ]
+
+
+@generator("08")
+def day08(rng: random.Random, n: int) -> list[str]:
+    names = iter(
+        rng.sample(
+            [a + b + c for a in ALPHA for b in ALPHA + DIGITS for c in ALPHA[1:-1]], 100 * n
+        )
+    )
+    lines, total = ["".join(rng.choices("LR", k=31)) + "\n", "\n"], 100 * n
+    for i, ln in enumerate([total - 5 * (total // 6)] + [total // 6] * 5):
+        start, end = ("AAA", "ZZZ") if i == 0 else (f"{i}{i}A", f"{i}{i}Z")
+        chain = [start] + [next(names) for _ in range(ln - 2)] + [end]
+        for a, b in zip(chain, chain[1:] + [chain[1]]):
+            lines.append(f"{a} = ({b}, {b})\n")
+    return lines
+
+
+@generator("09")
+def day09(rng: random.Random, n: int) -> list[str]:
+    lines = []
+    for _ in range(100 * n):
+        cs = [rng.randint(-9, 9) for _ in range(rng.randint(2, 8))]
+        lines.append(" ".join(str(sum(c * x**i for i, c in enumerate(cs))) for x in range(21)))
+        lines[-1] += "\n"
+    return lines
+
+
+@generator("10")
+def day10(rng: random.Random, n: int) -> list[str]:
+    size = side(n, 20)
+    lines = ["F" + "-" * (size - 3) + "7."]
+    lines.extend("|" + "." * (size - 3) + "|." for _ in range(size - 3))
+    lines.append("S" + "-" * (size - 3) + "J.")
+    lines.append("." * size)
+    return [line + "\n" for line in lines]
+
+
+@generator("11")
+def day11(rng: random.Random, n: int) -> list[str]:
+    size = side(n, 20)
+    return ["".join(rng.choices(".#", [30, 1], k=size)) + "\n" for _ in range(size)]
+
+
+@generator("12")
+def day12(rng: random.Random, n: int) -> list[str]:
+    lines = []
+    for _ in range(100 * n):
+        springs = "".join(rng.choices(".#", k=rng.randint(6, 18))) + "#"
+        groups = [len(g) for g in springs.split(".") if g]
+        masked = "".join(c if rng.random() < 0.4 else "?" for c in springs)
+        lines.append(f"{masked} {','.join(map(str, groups))}\n")
+    return lines
+
+
+@generator("13")
+def day13(rng: random.Random, n: int) -> list[str]:
+    lines = []
+    for _ in range(10 * n):
+        width, height = rng.randint(5, 17), rng.randint(3, 8)
+        rows = ["".join(rng.choices(".#", k=width)) for _ in range(height)]
+        lines.extend(row + "\n" for row in rows + rows[::-1])
+        lines.append("\n")
+    return lines[:-1]
+
+
+@generator("14")
+def day14(rng: random.Random, n: int) -> list[str]:
+    size = side(n, 10)
+    return ["".join(rng.choices(".O#", [6, 2, 1], k=size)) + "\n" for _ in range(size)]
+
+
+@generator("15")
+def day15(rng: random.Random, n: int) -> list[str]:
+    labels = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))) for _ in range(50)]
+    steps = [
+        (
+            f"{rng.choice(labels)}={rng.randint(1, 9)}"
+            if rng.random() < 0.7
+            else f"{rng.choice(labels)}-"
+        )
+        for _ in range(200 * n)
+    ]
+    return [",".join(steps) + "\n"]
+
+
+@generator("16")
+def day16(rng: random.Random, n: int) -> list[str]:
+    size = side(n, 10)
+    return ["".join(rng.choices(".|-/\\", [40, 1, 1, 1, 1], k=size)) + "\n" for _ in range(size)]
+
+
+@generator("17")
+def day17(rng: random.Random, n: int) -> list[str]:
+    size = side(n, 12)
+    return ["".join(rng.choices("123456789", k=size)) + "\n" for _ in range(size)]
+
+
+@generator("18")
+def day18(rng: random.Random, n: int) -> list[str]:
+    plan, codes = [[], []], []
+    for ds, hi in zip(plan, [9, 16**5 // (50 * n) - 1]):  # a staircase right and down, and back
+        for _ in range(50 * n):
+            ds.extend([rng.randint(1, hi), rng.randint(1, hi)])
+        ds.extend([sum(ds[::2]), sum(ds[1::2])])
+    codes = ["R", "D"] * 50 * n + ["L", "U"]
+    return [f"{d} {ln} (#{hx:05x}{'RDLU'.index(d)})\n" for d, ln, hx in zip(codes, *plan)]
+
+
+@generator("19")
+def day19(rng: random.Random, n: int) -> list[str]:
+    names = ["in"] + ["".join(rng.choices(string.ascii_lowercase, k=3)) for _ in range(20 * n - 1)]
+    names = list(dict.fromkeys(names))
+    lines = []
+    for i, name in enumerate(names):
+        rules = []
+        for j in range(rng.randint(1, 3)):
+            child = 2 * i + j + 1
+            target = names[child] if child < len(names) else rng.choice("AR")
+            rules.append(f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}")
+        lines.append(f"{name}{{{','.join(rules)},{rng.choice('AR')}}}\n")
+    lines.append("\n")
+    for _ in range(50 * n):
+        x, m, a, s = (rng.randint(1, 4000) for _ in range(4))
+        lines.append(f"{{x={x},m={m},a={a},s={s}}}\n")
+    return lines
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,99 @@
+"""Incremental solving of the parts which answers are sums over the lines of the input.
+
+The result of every line is stored under the digest of the line, so re-solving an input that
+grew or changed by a few lines only solves those lines::
+
+    python -m aoc.incremental 12 2 --store .cache/day12.db    # prints the answer of 12/2
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import doctest
+import hashlib
+import operator
+import shelve
+import sys
+from typing import Any, Callable, MutableMapping
+
+from aoc import days, inputs
+
+# the parts summing the results of independent lines, with the value of a line result
+values: dict[tuple[str, int], Callable[[Any], int]] = {
+    ("01", 1): int,
+    ("01", 2): int,
+    ("02", 1): int,
+    ("02", 2): int,
+    ("04", 1): int,
+    ("09", 1): operator.itemgetter(-1),
+    ("09", 2): operator.itemgetter(-1),
+    ("12", 1): int,
+    ("12", 2): int,
+}
+
+
+class Incremental:
+    """Running sum of a part over the lines of an input, updated as the input changes.
+
+    >>> puzzle = days.load("12").example1.splitlines()
+    >>> inc = Incremental("12", 2)
+    >>> inc.update(puzzle), inc.solved
+    (525152, 6)
+
+    >>> puzzle[3] = "????.#...#... 4,1,2"
+    >>> inc.update(puzzle + ["???.### 1,1,3"]), inc.solved
+    (525137, 1)
+    """
+
+    def __init__(self, day: str, part: int, store: MutableMapping[str, int] | None = None):
+        self.day, self.part = day, part
+        self.value = values[day, part]
+        self.store = {} if store is None else store
+        self.total, self.solved = 0, 0
+        self._digests: collections.Counter[str] = collections.Counter()
+
+    def update(self, puzzle: list[str]) -> int:
+        """Return the answer for the puzzle, solving only the lines not seen before."""
+        digests, self.solved = collections.Counter(), 0
+        for line in puzzle:
+            line = line.rstrip("\n")
+            key = f"{self.day}/{self.part}/{hashlib.sha1(line.encode()).hexdigest()}"
+            if key not in self.store:
+                self.store[key] = sum(map(self.value, days.run(self.day, self.part, [line])))
+                self.solved += 1
+            digests[key] += 1
+        for key, n in (digests - self._digests).items():
+            self.total += n * self.store[key]
+        for key, n in (self._digests - digests).items():
+            self.total -= n * self.store[key]
+        self._digests = digests
+        return self.total
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("day")
+    parser.add_argument("part", type=int)
+    parser.add_argument("--input", help="the input of the day (the one of the year)")
+    parser.add_argument("--store", required=True, help="the file storing the line results")
+    args = parser.parse_args(argv)
+
+    with shelve.open(args.store) as store, inputs.open_input(
+        args.input or days.path(args.day)
+    ) as f:
+        inc = Incremental(args.day, args.part, store)
+        print(inc.update(f.readlines()))
+        print(f"{inc.solved} lines solved", file=sys.stderr)
+    return 0
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Puzzle inputs stored compressed, alone or packed by the many in an archive.
+
+An input `2023/day12.in` may be stored as `day12.in.gz`, `.xz` or `.bz2` instead, read line
+by line as it decompresses. A packed archive is a zip file of inputs stored under their day,
+its central directory indexes the members, so any one is read without the others::
+
+    python -m aoc.inputs pack corpus.zip 12 big/day12-*.in   # add inputs of day 12
+    python -m aoc.inputs list corpus.zip                     # the members, by day
+    python -m aoc.schedule --inputs corpus.zip               # the members named NN/dayNN.in
+
+A member is addressed as `corpus.zip::12/day12-a.in` wherever a path to an input is expected.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bz2
+import doctest
+import gzip
+import io
+import lzma
+import os
+import sys
+import zipfile
+from typing import IO, Callable
+
+separator = "::"  # between the path of an archive and the name of a member
+
+# the openers of the compressed inputs in text mode, by suffix
+openers: dict[str, Callable[[str], IO[str]]] = {
+    ".gz": lambda path: gzip.open(path, "rt"),
+    ".xz": lambda path: lzma.open(path, "rt"),
+    ".bz2": lambda path: bz2.open(path, "rt"),
+}
+
+
+def find(path: str) -> str:
+    """Return the path of the input, or of its first compressed version that exists.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     base = os.path.join(tmp, "day01.in")
+    ...     with gzip.open(base + ".gz", "wt") as f:
+    ...         _ = f.write("1abc2\\n")
+    ...     find(base) == base + ".gz", find("no/day01.in")
+    (True, 'no/day01.in')
+    """
+    for candidate in [path, *(path + suffix for suffix in openers)]:
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+
+def open_input(path: str) -> IO[str]:
+    """Open the input as text, decompressing it on the fly, or a member of an archive.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     base = os.path.join(tmp, "day01.in")
+    ...     with lzma.open(base + ".xz", "wt") as f:
+    ...         _ = f.write("1abc2\\npqr3stu8vwx\\n")
+    ...     with open_input(find(base)) as f:
+    ...         f.readlines()
+    ['1abc2\\n', 'pqr3stu8vwx\\n']
+    """
+    if separator in path:
+        archive, _, member = path.partition(separator)
+        with zipfile.ZipFile(archive) as zf:
+            return io.TextIOWrapper(zf.open(member))  # the member keeps the file open
+    suffix = os.path.splitext(path)[1]
+    return openers[suffix](path) if suffix in openers else open(path)
+
+
+def locate(inputs: str, day: str) -> str:
+    """Return the path of the input of the day in a directory of inputs, or in an archive.
+
+    >>> locate("2023", "01"), locate("corpus.zip", "01")
+    ('2023/day01.in', 'corpus.zip::01/day01.in')
+    """
+    if inputs.endswith(".zip"):
+        return f"{inputs}{separator}{day}/day{day}.in"
+    return find(f"{inputs}/day{day}.in")
+
+
+def read(path: str) -> list[str]:
+    with open_input(path) as f:
+        return f.readlines()
+
+
+def pack(archive: str, day: str, paths: list[str]) -> list[str]:
+    """Add the inputs of the day to the archive, returning the paths of the new members.
+
+    >>> import tempfile
+    >>> tmpdir = tempfile.TemporaryDirectory()
+    >>> tmp = tmpdir.name
+    >>> for name, text in [("a.in", "1abc2\\n"), ("b.in.gz", "treb7uchet\\n")]:
+    ...     with (gzip.open if name.endswith(".gz") else open)(f"{tmp}/{name}", "wt") as f:
+    ...         _ = f.write(text)
+    >>> pack(f"{tmp}/corpus.zip", "01", [f"{tmp}/a.in", f"{tmp}/b.in.gz"])[1][len(tmp):]
+    '/corpus.zip::01/b.in'
+    >>> members(f"{tmp}/corpus.zip", "01")
+    ['01/a.in', '01/b.in']
+    >>> read(f"{tmp}/corpus.zip::01/b.in")
+    ['treb7uchet\\n']
+    >>> tmpdir.cleanup()
+    """
+    added = []
+    with zipfile.ZipFile(archive, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for path in paths:
+            name = os.path.basename(path)
+            root, suffix = os.path.splitext(name)
+            name = root if suffix in openers else name
+            with open_input(path) as f:
+                zf.writestr(f"{day}/{name}", f.read())
+            added.append(f"{archive}{separator}{day}/{name}")
+    return added
+
+
+def members(archive: str, day: str | None = None) -> list[str]:
+    """Return the names of the inputs in the archive, of the day or of all of them."""
+    with zipfile.ZipFile(archive) as zf:
+        names = zf.namelist()
+    return sorted(n for n in names if day is None or n.startswith(f"{day}/"))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    packing = commands.add_parser("pack", help="add inputs of a day to an archive")
+    packing.add_argument("archive")
+    packing.add_argument("day")
+    packing.add_argument("paths", nargs="+")
+    listing = commands.add_parser("list", help="list the inputs of an archive")
+    listing.add_argument("archive")
+    listing.add_argument("day", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        print("\n".join(pack(args.archive, args.day, args.paths)))
+    else:
+        with zipfile.ZipFile(args.archive) as zf:
+            for name in members(args.archive, args.day):
+                info = zf.getinfo(name)
+                print(f"{name}  {info.file_size}  {info.compress_size}")
+    return 0
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Microbenchmarks of the helpers called in the inner loops of the daily puzzles.
+
+Every helper is timed in a few fresh processes, each taking samples of a loop which count is
+calibrated for a sample to last long enough for the clock. The speed of the whole machine
+drifts from a run to the next, by half on a shared one, so every sample is followed by one of
+a `reference` loop of the interpreter and a helper costs the ratio of the two, which hardly
+drifts. The outlying costs of a process are rejected, and the median of the medians of the
+processes is compared with the one recorded in `2023/baseline.json`. A helper may grow by the
+tolerance, or by twice the interquartile spread of the medians, measured or recorded, if
+wider::
+
+    python -m aoc.microbench                       # all helpers
+    python -m aoc.microbench 15/calc_hash 12/is_group --processes 16
+    python -m aoc.microbench --record              # store the costs as the baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import doctest
+import importlib
+import multiprocessing
+import statistics
+import sys
+import timeit
+
+from aoc import baseline, days, scaling
+
+section = "micro"  # the costs of the helpers, in loops of the reference
+spreads = "micro-spread"  # the relative spreads of the medians of the processes
+
+reference = "sorted(range(16, 0, -1))"
+
+# the statement timed for every helper, with the module it runs in and an optional setup
+benches: dict[str, tuple[str, ...]] = {
+    "03/Labels.around": (
+        "03",
+        "labels.around(23)",
+        "labels = Labels.from_puzzle(example1.splitlines())",
+    ),
+    "07/HandType.from_str": ("07", "HandType.from_str('KTJJT')"),
+    "07/opt": ("07", "opt('KTJJT')"),
+    "10/Tile.from_str": ("10", "Tile.from_str('F')"),
+    "10/Tile.other": ("10", "Tile.ESPIPE.other(Dir.W)"),
+    "12/is_group": ("12", "is_group('##?#.')"),
+    "15/calc_hash": ("15", "calc_hash('rn=1')"),
+    "16/Type.beam": ("16", "Type.SPLITTER_VERTICAL.beam(Dir.R)"),
+    "16/Type.proj": ("16", "Type.MIRROR.proj(Dir.L)"),
+    "16/Type.slide": ("16", "Type.SPLITTER_HORIZONTAL.slide(Dir.U)"),
+    "17/Dir.next_pos": ("17", "Dir.R.next_pos(3, 4, 2)"),
+    "bitset.from_str": ("aoc.bitset", "from_str('#.##..##.')"),  # was `day13.as_num`
+}
+
+
+def timer(name: str) -> timeit.Timer:
+    module, stmt, *setup = benches[name]
+    module = days.load(module) if module.isdigit() else importlib.import_module(module)
+    return timeit.Timer(stmt, setup[0] if setup else "pass", globals=vars(module))
+
+
+def calibrate(name: str, min_time: float = 0.01) -> int:
+    """Return the number of loops, a power of two, for a sample to last at least `min_time`."""
+    loops, t = 1, timer(name)
+    while t.timeit(loops) < min_time:
+        loops *= 2
+    return loops
+
+
+def sample(name: str, loops: int, samples: int) -> list[tuple[float, float]]:
+    """Return the times per call of the samples and of the reference loops following them,
+    the first ones warming up discarded."""
+    t, r = timer(name), timeit.Timer(reference)
+    return [(t.timeit(loops) / loops, r.timeit(loops) / loops) for _ in range(samples + 1)][1:]
+
+
+def reject_outliers(times: list[float]) -> list[float]:
+    """Return the times, or costs, within 1.5 interquartile ranges of the quartiles.
+
+    >>> reject_outliers([1.0, 1.1, 0.9, 1.0, 1.05, 5.0, 0.95, 1.0])
+    [1.0, 1.1, 0.9, 1.0, 1.05, 0.95, 1.0]
+    """
+    if len(times) < 4:
+        return times
+    q1, _, q3 = statistics.quantiles(times, n=4)
+    lo, hi = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    return [t for t in times if lo <= t <= hi]
+
+
+def spread(medians: list[float]) -> float:
+    """Return the interquartile range of the medians relative to their median, 0 for fewer
+    than two.
+
+    >>> round(spread([1.0, 1.2, 0.9, 1.1, 1.0, 3.0]), 3)
+    0.167
+    """
+    if len(medians) < 2:
+        return 0.0
+    q1, _, q3 = statistics.quantiles(medians, n=4, method="inclusive")
+    return (q3 - q1) / statistics.median(medians)
+
+
+def measure(
+    name: str, processes: int = 8, samples: int = 10, min_time: float = 0.01
+) -> tuple[list[float], float, int, int]:
+    """Return the median cost of fresh processes started one after the other, with the median
+    time per call and the numbers of samples kept and taken.
+
+    >>> medians, time, kept, taken = measure("15/calc_hash", processes=2, samples=3)
+    >>> len(medians), 0 < statistics.median(medians) < 100, 0 < time < 1e-3, kept <= taken == 6
+    (2, True, True, True)
+    """
+    loops, spawn = calibrate(name, min_time), multiprocessing.get_context("spawn")
+    medians, times, kept = [], [], 0
+    for _ in range(processes):  # one at a time, not to compete for the cpu, none warmed here
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=spawn) as pool:
+            pairs = pool.submit(sample, name, loops, samples).result()
+        costs = reject_outliers([t / r for t, r in pairs])
+        medians.append(statistics.median(costs))
+        times, kept = times + [t for t, _ in pairs], kept + len(costs)
+    return medians, statistics.median(times), kept, len(times)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("names", nargs="*", default=sorted(benches))
+    parser.add_argument("--processes", type=int, default=8, help="the fresh processes")
+    parser.add_argument("--samples", type=int, default=10, help="the samples per process")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth")
+    parser.add_argument("--record", action="store_true", help="store the measured costs")
+    args = parser.parse_args(argv)
+
+    recorded, measured = baseline.load(section), {}
+    recorded_spreads, measured_spreads = baseline.load(spreads), {}
+    rows = [["helper", "ns/call", "cost", "spread", "kept", "recorded"]]
+    for name in args.names:
+        medians, time, kept, taken = measure(name, args.processes, args.samples)
+        measured[name] = round(statistics.median(medians), 3)
+        measured_spreads[name] = round(spread(medians), 3)
+        rows.append(
+            [
+                name,
+                f"{time * 1e9:.1f}",
+                f"{measured[name]:.3f}",
+                f"{measured_spreads[name]:.1%}",
+                f"{kept}/{taken}",
+                f"{recorded[name]:.3f}" if name in recorded else "-",
+            ]
+        )
+    print(scaling.table(rows))
+
+    if args.record:
+        baseline.save(section, measured)
+        baseline.save(spreads, measured_spreads)
+        return 0
+    tolerances = {
+        name: max(args.tolerance, 2 * s, 2 * recorded_spreads.get(name, 0.0))
+        for name, s in measured_spreads.items()
+    }
+    regressions = baseline.compare(recorded, measured, tolerances, relative=True)
+    for name, (before, after) in regressions.items():
+        print(f"{name}: {before:.3f} -> {after:.3f}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Low overhead sampling profiler for the daily puzzles.
+
+A background thread records the stack of the solving thread at a fixed interval, the samples
+are aggregated as collapsed stacks (the input of `flamegraph.pl` and speedscope). It is opt-in
+and set by the environment, so it can be left on in long running workers::
+
+    AOC_SAMPLING=0.001 AOC_SAMPLING_OUT=stacks.txt python -m aoc.schedule
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import doctest
+import os
+import sys
+import threading
+from types import FrameType
+from typing import Iterator
+
+interval = float(os.environ.get("AOC_SAMPLING", 0))  # in seconds, zero turns it off
+output = os.environ.get("AOC_SAMPLING_OUT", "")
+
+profiles: dict[str, collections.Counter[str]] = collections.defaultdict(collections.Counter)
+
+
+class Sampler:
+    """Sample the stack of a thread (the current one by default) every `interval` seconds.
+
+    >>> from aoc import days
+    >>> days.load("12").arrange.cache_clear()
+    >>> with Sampler(interval=0.001) as sampler:
+    ...     _ = days.run("12", 1, days.read("12"))
+    >>> any(stack.endswith("day12.arrange") for stack in sampler.stacks)
+    True
+    """
+
+    def __init__(
+        self, interval: float = 0.001, thread_id: int | None = None, root: FrameType | None = None
+    ) -> None:
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.root = root  # the frame running the `with` block, not part of the stacks
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="sampler", daemon=True)
+
+    def __enter__(self) -> Sampler:
+        if self.root is None and self.thread_id == threading.get_ident():
+            self.root = sys._getframe(1)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            if frame := sys._current_frames().get(self.thread_id):
+                self.stacks[collapse(frame, self.root)] += 1
+
+
+def collapse(frame: FrameType | None, root: FrameType | None = None) -> str:
+    """Return the stack of the frame up to the root, outermost call first, separated by `;`."""
+    names = []
+    while frame is not None and frame is not root:
+        code = frame.f_code
+        names.append(
+            f"{os.path.basename(code.co_filename).removesuffix('.py')}.{code.co_qualname}"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+@contextlib.contextmanager
+def sampled(key: str) -> Iterator[None]:
+    """Sample the body into the profile of the key, if sampling is on, even if it raises.
+
+    >>> import aoc.sampling, time
+    >>> aoc.sampling.interval, before = 0.0005, aoc.sampling.interval
+    >>> try:
+    ...     with aoc.sampling.sampled("00/1"):
+    ...         end = time.perf_counter() + 0.05
+    ...         while time.perf_counter() < end:
+    ...             pass
+    ...         raise RuntimeError("failed part")
+    ... except RuntimeError:
+    ...     pass
+    >>> aoc.sampling.interval = before
+    >>> sum(aoc.sampling.profiles.pop("00/1").values()) > 0
+    True
+    """
+    if not interval:
+        yield
+        return
+    sampler = Sampler(interval, root=sys._getframe(2))  # skip `contextlib` frame
+    try:
+        with sampler:
+            yield
+    finally:
+        profiles[key].update(sampler.stacks)
+        if output:
+            with open(output, "a") as f:
+                f.write(dump({key: sampler.stacks}))
+
+
+def dump(profiles: dict[str, collections.Counter[str]]) -> str:
+    """Format the profiles as collapsed stacks, rooted at their keys.
+
+    >>> print(dump({"12/1": collections.Counter({"day12.part_one;day12.arrange": 3})}), end="")
+    12/1;day12.part_one;day12.arrange 3
+    """
+    return "".join(
+        f"{key};{stack} {n}\n" for key, stacks in profiles.items() for stack, n in stacks.items()
+    )
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,106 @@
+"""Empirical complexity scaling of the daily puzzles.
+
+Every part is timed on generated inputs of growing size, and the exponent `k` of the best
+fitting power law `time ~ size ** k` is compared with the recorded one::
+
+    python -m aoc.scaling                 # all days, sizes 1x, 2x, 4x ... 64x
+    python -m aoc.scaling 11 14 --max 16  # only some days, sizes 1x ... 16x
+    python -m aoc.scaling --record        # store the measured exponents as the baseline
+"""
+
+import argparse
+import doctest
+import gc
+import math
+import sys
+import time
+
+from aoc import baseline, days, generate
+
+section = "scaling"
+
+
+def measure(day: str, part: int, n: int, repeat: int = 3) -> tuple[int, float]:
+    """Return the size of the generated input and the best time to solve it."""
+    puzzle, best = generate.generate(day, n), math.inf
+    for _ in range(repeat):
+        uncache(day)
+        gc.collect()
+        start = time.perf_counter()
+        days.run(day, part, puzzle)
+        best = min(best, time.perf_counter() - start)
+    return sum(map(len, puzzle)), best
+
+
+def uncache(day: str) -> None:
+    """Clear the caches of the day, so that every run starts from scratch."""
+    for obj in vars(days.load(day)).values():
+        if callable(getattr(obj, "cache_clear", None)):
+            obj.cache_clear()
+
+
+def exponent(samples: list[tuple[int, float]]) -> float:
+    """Return the slope of the least squares fit of the samples in log-log scale.
+
+    >>> round(exponent([(1, 2.0), (2, 8.0), (4, 32.0)]), 2)
+    2.0
+
+    >>> round(exponent([(10, 1.0), (20, 2.1), (40, 3.9), (80, 8.2)]), 2)
+    1.0
+    """
+    xs, ys = [math.log(x) for x, _ in samples], [math.log(y) for _, y in samples]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    num = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    return num / sum((x - mx) ** 2 for x in xs)
+
+
+def table(rows: list[list[str]]) -> str:
+    """Format the rows as a plain text table.
+
+    >>> print(table([["day", "k"], ["01/1", "1.02"]]))
+    day   k
+    01/1  1.02
+    """
+    widths = [max(map(len, col)) for col in zip(*rows)]
+    return "\n".join("  ".join(c.ljust(w) for c, w in zip(r, widths)).rstrip() for r in rows)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", default=sorted(generate.generators))
+    parser.add_argument("--max", type=int, default=64, help="the largest relative size")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed exponent growth")
+    parser.add_argument("--record", action="store_true", help="store the measured exponents")
+    args = parser.parse_args(argv)
+
+    sizes = [2**i for i in range(args.max.bit_length())]
+    recorded, measured = baseline.load(section), {}
+    rows = [["part", *(f"{n}x" for n in sizes), "k", "recorded"]]
+    for day in args.days:
+        for part in (1, 2):
+            key = f"{day}/{part}"
+            samples = [measure(day, part, n) for n in sizes]
+            measured[key] = round(exponent(samples), 2)
+            times = [f"{t * 1000:.1f}ms" for _, t in samples]
+            rows.append([key, *times, f"{measured[key]:.2f}", str(recorded.get(key, "-"))])
+            print(table(rows[-1:]), file=sys.stderr, flush=True)
+    print(table(rows))
+
+    if args.record:
+        baseline.save(section, measured)
+        return 0
+    worse = baseline.compare(recorded, measured, args.tolerance)
+    for key, (old, new) in worse.items():
+        print(f"{key}: the exponent {new:.2f} is worse than the recorded {old:.2f}")
+    return 1 if worse else 0
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    sys.exit(main())
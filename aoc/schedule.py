@@ -0,0 +1,200 @@
+"""Parallel scheduler solving the daily puzzles on a pool of worker processes.
+
+Tasks are started longest first, based on the timings stored by the previous runs, so that
+a whole pass takes about as long as the slowest part. The timings of every set of inputs are
+kept in the cache directory of the user, over those recorded in `2023/baseline.json`::
+
+    python -m aoc.schedule                        # all days with the inputs of the year
+    python -m aoc.schedule 12 16 --timeout 30     # only some days, with a per task timeout
+    python -m aoc.schedule --inputs other/2023    # a different set of `dayNN.in` inputs
+    python -m aoc.schedule --record               # store the timings as the year's baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import doctest
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Any, cast
+
+from aoc import baseline, days, inputs, trace
+
+section = "timings"
+
+
+def path() -> str:
+    """Return the file of the timings of the previous runs, in the cache directory."""
+    return baseline.cache("timings.json", "AOC_TIMINGS")
+
+
+def load(inputs: str) -> dict[str, float]:
+    """Return the timings of the last runs on the inputs, over the recorded ones.
+
+    >>> import tempfile
+    >>> from unittest.mock import patch
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     with patch.dict(os.environ, AOC_TIMINGS=os.path.join(tmp, "timings.json")):
+    ...         save("other.zip", {"12/2": 1.5})
+    ...         load("other.zip")["12/2"], load(days.year) == baseline.load(section)
+    (1.5, True)
+    """
+    return baseline.load(section) | baseline.read(path(), os.path.abspath(inputs))
+
+
+def save(inputs: str, timings: dict[str, float]) -> None:
+    baseline.update(path(), os.path.abspath(inputs), timings)
+
+
+@dataclass
+class Task:
+    """A part of the day to solve, with the estimated time it takes."""
+
+    day: str
+    part: int
+    path: str
+    estimate: float = math.inf
+    status: str = "pending"  # pending, running, done, failed, timeout or cancelled
+    result: Any = None
+    elapsed: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return f"{self.day}/{self.part}"
+
+
+class Scheduler:
+    """Run the tasks on at most `workers` processes, longest processing time first.
+
+    >>> tasks = [Task("01", 1, days.path("01"), 0.1), Task("01", 2, days.path("01"), 0.2)]
+    >>> [(t.key, t.status, sum(t.result)) for t in Scheduler(tasks, workers=2).run()]
+    [('01/2', 'done', 54985), ('01/1', 'done', 55130)]
+
+    >>> tasks = [Task("12", 2, days.path("12"))]
+    >>> [(t.key, t.status, t.result) for t in Scheduler(tasks, timeout=0.01).run()]
+    [('12/2', 'timeout', None)]
+    """
+
+    def __init__(
+        self, tasks: list[Task], workers: int | None = None, timeout: float | None = None
+    ) -> None:
+        self.tasks = sorted(tasks, key=lambda t: t.estimate, reverse=True)
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop the running tasks and skip the pending ones, safe to call from any thread."""
+        self._cancelled.set()
+
+    def run(self) -> list[Task]:
+        for day in {t.day for t in self.tasks}:  # imported once, shared by the forked workers
+            days.load(day)
+        pending = list(reversed(self.tasks))
+        running: dict[Connection, tuple[Task, multiprocessing.Process, float]] = {}
+        try:
+            while (pending or running) and not self._cancelled.is_set():
+                while pending and len(running) < self.workers:
+                    task = pending.pop()
+                    rx, tx = multiprocessing.Pipe(duplex=False)
+                    proc = multiprocessing.Process(
+                        target=work, args=(tx, task.day, task.part, task.path)
+                    )
+                    proc.start()
+                    tx.close()
+                    task.status, running[rx] = "running", (task, proc, time.perf_counter())
+                for rx in cast(list[Connection], wait(list(running), timeout=0.01)):
+                    task, proc, _ = running.pop(rx)
+                    try:
+                        task.status, task.result, task.elapsed, spans = rx.recv()
+                        trace.events.extend(spans)
+                    except EOFError:  # the worker died without a word
+                        task.status, task.result = "failed", f"exit code {proc.exitcode}"
+                    proc.join()
+                    rx.close()
+                now = time.perf_counter()
+                for rx, (task, proc, started) in list(running.items()):
+                    if self.timeout is not None and now - started > self.timeout:
+                        stop(proc)
+                        task.status, task.elapsed = "timeout", now - started
+                        del running[rx]
+                        rx.close()
+        finally:
+            for task, proc, started in running.values():
+                stop(proc)
+                task.status, task.elapsed = "cancelled", time.perf_counter() - started
+            for task in pending:
+                task.status = "cancelled"
+        return self.tasks
+
+
+def work(conn: Connection, day: str, part: int, path: str) -> None:
+    start, _ = time.perf_counter(), trace.drain()  # the events of the parent are its own
+    trace.name_process(f"{day}/{part}")
+    try:
+        with inputs.open_input(path) as f, trace.span("read"):
+            puzzle = f.readlines()
+        result = days.run(day, part, puzzle)
+        conn.send(("done", result, time.perf_counter() - start, trace.drain()))
+    except Exception as e:
+        conn.send(("failed", repr(e), time.perf_counter() - start, trace.drain()))
+    finally:
+        conn.close()
+
+
+def stop(proc: multiprocessing.Process) -> None:
+    proc.terminate()
+    proc.join()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", default=days.names())
+    parser.add_argument(
+        "--inputs", default=days.year, help="the directory or archive of the inputs"
+    )
+    parser.add_argument("--workers", type=int, help="the number of processes (all cpus)")
+    parser.add_argument("--timeout", type=float, help="the limit of a task in seconds")
+    parser.add_argument("--record", action="store_true", help="store the year's timings")
+    args = parser.parse_args(argv)
+    if args.record and args.inputs != days.year:
+        parser.error("only the timings of the inputs of the year are recorded")
+
+    timings = load(args.inputs)
+    tasks = [
+        Task(day, part, inputs.locate(args.inputs, day), timings.get(f"{day}/{part}", math.inf))
+        for day in args.days
+        for part in (1, 2)
+    ]
+    start, scheduler = time.perf_counter(), Scheduler(tasks, args.workers, args.timeout)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.cancel()
+    for t in sorted(tasks, key=lambda t: t.key):
+        print(f"{t.key}  {t.status:9}  {t.elapsed:8.3f}s  (estimated {t.estimate:.3f}s)")
+    total = sum(t.elapsed for t in tasks)
+    print(f"wall {time.perf_counter() - start:.3f}s, sum of tasks {total:.3f}s")
+
+    measured = {t.key: round(t.elapsed, 4) for t in tasks if t.status == "done"}
+    save(args.inputs, measured)
+    if args.record:
+        baseline.save(section, measured)
+    return 0 if all(t.status == "done" for t in tasks) else 1
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Grids of byte cells in flat buffers, placed in shared memory for the workers of a pool.
+
+A `SharedGrid` pickles as the name of its memory block and its size, so sending it to a
+worker costs a few bytes: the worker attaches a view of the same cells instead of copying
+them. The process that created it unlinks the block when done::
+
+    with shared.share(grid) as cells:
+        fanout.fanout(search, cells, jobs, reduce=max)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import doctest
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, cast
+
+from aoc import fanout
+
+
+class FlatGrid:
+    """A `width` by `height` grid of byte cells, stored row after row.
+
+    >>> grid = FlatGrid.from_lines(["#..", ".|.", "..#"])
+    >>> grid.width, grid.height, chr(grid[1, 1]), grid.row(2)
+    (3, 3, '|', b'..#')
+    """
+
+    __slots__ = ("cells", "width", "height")
+
+    def __init__(self, cells: bytes | bytearray | memoryview, width: int, height: int) -> None:
+        self.cells, self.width, self.height = cells, width, height
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> FlatGrid:
+        rows = [line.encode() for line in lines]
+        return cls(b"".join(rows), len(rows[0]) if rows else 0, len(rows))
+
+    def __getitem__(self, pos: tuple[int, int]) -> int:
+        return self.cells[pos[1] * self.width + pos[0]]
+
+    def row(self, y: int) -> bytes:
+        return bytes(self.cells[y * self.width : (y + 1) * self.width])
+
+
+class SharedGrid(FlatGrid):
+    """A flat grid in a block of shared memory.
+
+    >>> import pickle
+    >>> with SharedGrid.create(FlatGrid.from_lines(["#..", ".|."])) as grid:
+    ...     view = pickle.loads(pickle.dumps(grid))
+    ...     size = len(pickle.dumps(grid))
+    ...     grid.cells[1] = ord("#")
+    ...     print(view.row(0), chr(view[1, 1]), size < 200)
+    ...     view.close()
+    b'##.' | True
+    """
+
+    __slots__ = ("shm", "owner")
+
+    def __init__(
+        self, shm: shared_memory.SharedMemory, width: int, height: int, owner: bool = False
+    ) -> None:
+        super().__init__(cast(memoryview, shm.buf)[: width * height], width, height)
+        self.shm, self.owner = shm, owner
+
+    @classmethod
+    def create(cls, grid: FlatGrid) -> SharedGrid:
+        """Return a copy of the grid in a new block, unlinked when the copy is closed."""
+        shm = shared_memory.SharedMemory(create=True, size=max(1, grid.width * grid.height))
+        cast(memoryview, shm.buf)[: grid.width * grid.height] = grid.cells
+        return cls(shm, grid.width, grid.height, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, width: int, height: int) -> SharedGrid:
+        return cls(shared_memory.SharedMemory(name), width, height)
+
+    def __reduce__(self):
+        return SharedGrid.attach, (self.shm.name, self.width, self.height)
+
+    def __enter__(self) -> SharedGrid:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the view of the block, and free the block if this process created it."""
+        if isinstance(self.cells, memoryview):
+            self.cells.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+@contextlib.contextmanager
+def share(grid: FlatGrid, workers: int | None = None) -> Iterator[FlatGrid]:
+    """Return the grid in shared memory if the searches run on several processes.
+
+    >>> grid = FlatGrid.from_lines(["#.", ".#"])
+    >>> with share(grid, workers=1) as cells:
+    ...     cells is grid
+    True
+    >>> with share(grid, workers=2) as cells:
+    ...     type(cells).__name__, cells.row(1)
+    ('SharedGrid', b'.#')
+    """
+    if (workers or fanout.workers()) == 1:
+        yield grid
+        return
+    with SharedGrid.create(grid) as cells:
+        yield cells
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
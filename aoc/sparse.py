@@ -0,0 +1,123 @@
+"""Sparse sets of points of a plane, indexed by row and by column.
+
+The x of the points of every row and the y of the points of every column are kept sorted, so
+a rectangle is queried by bisection, a row or column is walked in order, and an update
+touches only the row and column of the point instead of rebuilding the whole set.
+"""
+
+from __future__ import annotations
+
+import bisect
+import doctest
+from typing import Iterable, Iterator
+
+
+class Points:
+    """A set of points, with the sorted indexes of their rows and columns.
+
+    >>> points = Points([(3, 0), (7, 1), (0, 2), (6, 4), (1, 5)])
+    >>> len(points), (7, 1) in points, points.rows[1], points.cols[0]
+    (5, True, [7], [2])
+
+    >>> points.add((4, 1))
+    >>> points.discard((0, 2))
+    >>> list(points)
+    [(3, 0), (4, 1), (7, 1), (6, 4), (1, 5)]
+
+    >>> list(points.window(2, 8, 0, 2)), points.count(0, 5, 0, 6)
+    ([(3, 0), (4, 1), (7, 1)], 3)
+    """
+
+    __slots__ = ("rows", "cols")
+
+    def __init__(self, points: Iterable[tuple[int, int]] = ()) -> None:
+        self.rows: dict[int, list[int]] = {}
+        self.cols: dict[int, list[int]] = {}
+        for x, y in sorted(set(points), key=lambda p: (p[1], p[0])):  # sorted, appends only
+            self.rows.setdefault(y, []).append(x)
+        for y in sorted(self.rows):
+            for x in self.rows[y]:
+                self.cols.setdefault(x, []).append(y)
+
+    @classmethod
+    def from_lanes(cls, lanes: dict[int, list[int]], vertical: bool = False) -> Points:
+        """Return the points of sorted rows (or columns), the other index built in order."""
+        points, other = cls(), {}
+        for k in sorted(lanes):
+            for v in lanes[k]:
+                other.setdefault(v, []).append(k)
+        lanes = {k: vs for k, vs in lanes.items() if vs}
+        points.rows, points.cols = (other, lanes) if vertical else (lanes, other)
+        return points
+
+    def __contains__(self, p: tuple[int, int]) -> bool:
+        xs = self.rows.get(p[1], [])
+        i = bisect.bisect_left(xs, p[0])
+        return i < len(xs) and xs[i] == p[0]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for y in sorted(self.rows):
+            for x in self.rows[y]:
+                yield x, y
+
+    def __len__(self) -> int:
+        return sum(map(len, self.rows.values()))
+
+    def add(self, p: tuple[int, int]) -> None:
+        if p not in self:
+            bisect.insort(self.rows.setdefault(p[1], []), p[0])
+            bisect.insort(self.cols.setdefault(p[0], []), p[1])
+
+    def discard(self, p: tuple[int, int]) -> None:
+        if p in self:
+            self.rows[p[1]].remove(p[0])
+            self.cols[p[0]].remove(p[1])
+            for lanes, k in ((self.rows, p[1]), (self.cols, p[0])):
+                if not lanes[k]:
+                    del lanes[k]
+
+    def window(self, x1: int, x2: int, y1: int, y2: int) -> Iterator[tuple[int, int]]:
+        """Return the points with `x1 <= x < x2` and `y1 <= y < y2`, row after row."""
+        for y in range(y1, y2):
+            if xs := self.rows.get(y):
+                for i in range(bisect.bisect_left(xs, x1), bisect.bisect_left(xs, x2)):
+                    yield xs[i], y
+
+    def count(self, x1: int, x2: int, y1: int, y2: int) -> int:
+        """Return the number of points of the window, without listing them."""
+        n = 0
+        for y in range(y1, y2):
+            if xs := self.rows.get(y):
+                n += bisect.bisect_left(xs, x2) - bisect.bisect_left(xs, x1)
+        return n
+
+    def expanded(self, factor: int) -> Points:
+        """Return the points with every empty row and column from 0 on `factor` times as wide,
+        through the prefix sums of the empty ones before every row and column.
+
+        >>> list(Points([(0, 0), (3, 1), (1, 4)]).expanded(10))
+        [(0, 0), (12, 1), (1, 22)]
+        """
+        mx, my = shifts(self.cols, factor), shifts(self.rows, factor)
+        expanded = Points()
+        expanded.rows = {my[y]: [mx[x] for x in xs] for y, xs in self.rows.items()}
+        expanded.cols = {mx[x]: [my[y] for y in ys] for x, ys in self.cols.items()}
+        return expanded
+
+
+def shifts(lanes: dict[int, list[int]], factor: int) -> dict[int, int]:
+    """Return the new coordinate of every lane, moved by the empty lanes from 0 to it."""
+    moved, empty, last = {}, 0, -1
+    for k in sorted(lanes):
+        empty += k - last - 1
+        moved[k], last = k + empty * (factor - 1), k
+    return moved
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
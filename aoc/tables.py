@@ -0,0 +1,93 @@
+"""Transition tables of the walks on grids, precomputed once and indexed by small integers.
+
+The days number their directions in their own order, which they name with the letters
+`U`, `D`, `L`, `R` (or `N`, `S`, `W`, `E`), as "UDLR" for `U, D, L, R = range(4)`. The
+tables follow that order, so a hot loop steps with `STEPS[d]` and turns with
+`TURNS[ord(tile) * 4 + d]` instead of comparing Enum members.
+"""
+
+import doctest
+
+ALIASES = {"N": "U", "S": "D", "W": "L", "E": "R"}
+
+STEP = {"U": (0, -1), "D": (0, 1), "L": (-1, 0), "R": (1, 0)}
+
+OPPOSITE = {"U": "D", "D": "U", "L": "R", "R": "L"}
+
+# the directions a beam leaves a tile of mirrors and splitters in, by the one it moves in
+MIRRORS = {
+    ".": {"U": "U", "D": "D", "L": "L", "R": "R"},
+    "/": {"U": "R", "D": "L", "L": "D", "R": "U"},
+    "\\": {"U": "L", "D": "R", "L": "U", "R": "D"},
+    "-": {"U": "LR", "D": "LR", "L": "L", "R": "R"},
+    "|": {"U": "U", "D": "D", "L": "UD", "R": "UD"},
+}
+
+# the two sides every pipe tile connects
+PIPES = {"|": "UD", "-": "LR", "L": "UR", "J": "UL", "7": "LD", "F": "RD"}
+
+
+def canonical(order: str) -> str:
+    return "".join(ALIASES.get(c, c) for c in order)
+
+
+def offsets(order: str) -> tuple[tuple[int, int], ...]:
+    """Return the step of every direction of the order.
+
+    >>> offsets("UDLR")
+    ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+    >>> offsets("NESW")
+    ((0, -1), (1, 0), (0, 1), (-1, 0))
+    """
+    return tuple(STEP[c] for c in canonical(order))
+
+
+def opposites(order: str) -> tuple[int, ...]:
+    """Return the opposite of every direction of the order.
+
+    >>> opposites("URDL")
+    (2, 3, 0, 1)
+    """
+    order = canonical(order)
+    return tuple(order.index(OPPOSITE[c]) for c in order)
+
+
+def pipes() -> dict[str, dict[str, str]]:
+    """Return the direction leaving every pipe tile, by the one entering it.
+
+    >>> pipes()["F"]
+    {'L': 'D', 'U': 'R'}
+    """
+    return {tile: {OPPOSITE[a]: b, OPPOSITE[b]: a} for tile, (a, b) in PIPES.items()}
+
+
+def transitions(order: str, tiles: dict[str, dict[str, str]]) -> list[int]:
+    """Return the table of the directions leaving the tiles, as bitmasks of the directions of
+    the order, at `ord(tile) * len(order) + d` for a move in the direction `d`; 0 where the
+    tile can't be entered that way.
+
+    >>> table = transitions("UDLR", MIRRORS)
+    >>> bin(table[ord("|") * 4 + 3]), bin(table[ord("/") * 4 + 0]), table[ord("#") * 4]
+    ('0b11', '0b1000', 0)
+
+    >>> table = transitions("NESW", pipes())
+    >>> table[ord("F") * 4 + 3], table[ord("F") * 4 + 1]
+    (4, 0)
+    """
+    order, table = canonical(order), [0] * (256 * len(order))
+    for tile, moves in tiles.items():
+        for move, leaves in moves.items():
+            table[ord(tile) * len(order) + order.index(move)] = sum(
+                1 << order.index(c) for c in leaves
+            )
+    return table
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,66 @@
+"""Extraction of the numbers embedded in puzzle lines, from `str` or `bytes` alike.
+
+Every extraction is one pass of a precompiled pattern. Lines of a fixed format, numbers
+separated by whitespace only, are faster split with `str.split` by their scan.
+"""
+
+import doctest
+import re
+from array import array
+
+_ints = re.compile(r"-?\d+"), re.compile(rb"-?\d+")
+_hexes = re.compile(r"#([0-9a-fA-F]+)"), re.compile(rb"#([0-9a-fA-F]+)")
+
+
+def ints(text: str | bytes) -> list[int]:
+    """Return the signed integers of the text, in order.
+
+    >>> ints("0 3 -6 9")
+    [0, 3, -6, 9]
+
+    >>> ints("Game 12: 3 blue, 4 red; 1 red")
+    [12, 3, 4, 1]
+
+    >>> ints(b"{x=787,m=2655,a=-1222,s=2876}")
+    [787, 2655, -1222, 2876]
+
+    >>> ints("seed-to-soil map:"), ints("1_000 +5")
+    ([], [1, 0, 5])
+    """
+    return list(map(int, findall(_ints, text)))
+
+
+def int_array(text: str | bytes) -> array:
+    """Return the signed integers of the text as a compact `array('q')`, for bulk parsing.
+
+    >>> int_array(b"1 2 3\\n-4 5 6\\n")
+    array('q', [1, 2, 3, -4, 5, 6])
+    """
+    return array("q", map(int, findall(_ints, text)))
+
+
+def hexes(text: str | bytes) -> list[int]:
+    """Return the hexadecimal numbers of the text, written with a leading `#`.
+
+    >>> hexes("R 6 (#70c710)")
+    [7390992]
+
+    >>> [f"{n:x}" for n in hexes(b"(#0dc571) (#5713f0)")]
+    ['dc571', '5713f0']
+    """
+    return [int(h, 16) for h in findall(_hexes, text)]
+
+
+def findall(patterns: tuple[re.Pattern[str], re.Pattern[bytes]], text: str | bytes) -> list:
+    if isinstance(text, bytes):
+        return patterns[1].findall(text)
+    return patterns[0].findall(text)
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
@@ -0,0 +1,159 @@
+"""Timeline of the phases of the daily puzzles, exported in the Chrome trace event format.
+
+Spans are recorded around the phases of the parts (read, scan, build, solve, reduce), in the
+main process as in the workers of the scheduler and of the fan-outs, which send theirs back
+with their results. It is opt-in and set by the environment, the trace is written when the
+main process exits and opens offline in `chrome://tracing` or https://ui.perfetto.dev::
+
+    AOC_TRACE=trace.json python -m aoc.schedule
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import doctest
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+output = os.environ.get("AOC_TRACE", "")
+enabled = bool(output)
+
+events: list[dict[str, Any]] = []
+
+
+def enable(on: bool = True) -> None:
+    """Turn tracing on or off in this process, whatever `AOC_TRACE` says."""
+    global enabled
+    enabled = on
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str = "phase", **args: Any) -> Iterator[None]:
+    """Record the body as a complete event, if tracing is on.
+
+    >>> enable()
+    >>> with span("solve", day="16"):
+    ...     with span("scan"):
+    ...         pass
+    >>> [(e["name"], e["args"]) for e in drain()]
+    [('scan', {}), ('solve', {'day': '16'})]
+    >>> enable(False)
+    """
+    if not enabled:
+        yield
+        return
+    start = time.monotonic_ns()
+    try:
+        yield
+    finally:
+        end = time.monotonic_ns()
+        events.append(
+            {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": args,
+            }
+        )
+
+
+def traced(fn: F) -> F:
+    """Record the calls of the function as spans. A generator (a `scan` that yields the
+    parsed lines) read lazily by its caller would interleave with the caller's work, so when
+    tracing is on its items are all taken at the first one, in its span, and the rest of the
+    part's span is the part's own.
+
+    >>> enable()
+    >>> @traced
+    ... def scan(puzzle):
+    ...     yield from map(int, puzzle)
+    >>> with span("01/1", cat="part"):
+    ...     items = scan(["1", "2"])
+    ...     first = next(items)
+    ...     with span("solve"):
+    ...         total = first + sum(items)
+    >>> total, [e["name"] for e in drain()]
+    (3, ['scan', 'solve', '01/1'])
+    >>> enable(False)
+    """
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def generator(*args, **kwargs):
+            if not enabled:
+                return (yield from fn(*args, **kwargs))
+            with span(fn.__name__):
+                items = list(fn(*args, **kwargs))
+            yield from items
+
+        return generator  # type: ignore
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(fn.__name__):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore
+
+
+def name_process(name: str) -> None:
+    """Name the lane of the current process in the timeline."""
+    if enabled:
+        events.append(
+            {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": name}}
+        )
+
+
+def drain() -> list[dict[str, Any]]:
+    """Return the events recorded so far and forget them, to send them to another process."""
+    drained = events[:]
+    events.clear()
+    return drained
+
+
+def merged(results: Iterable[tuple[T, list[dict[str, Any]]]]) -> Iterator[T]:
+    """Return the results sent by workers along their events, keeping the events."""
+    for result, worker_events in results:
+        events.extend(worker_events)
+        yield result
+
+
+def dump(events: list[dict[str, Any]]) -> str:
+    """Format the events as a Chrome trace.
+
+    >>> dump([])
+    '{"traceEvents": [], "displayTimeUnit": "ms"}'
+    """
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def save() -> None:
+    if events:
+        with open(output, "w") as f:
+            f.write(dump(events))
+
+
+if enabled:
+    atexit.register(save)  # workers leave with `os._exit`, only the main process writes
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    doctest.testmod()
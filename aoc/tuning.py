@@ -0,0 +1,170 @@
+"""Automatic choice of the engine of a part from the size of its input.
+
+The engines of a tuned part are timed once per machine on sample inputs of growing size,
+the fastest engine from each size on is stored, and the `auto` engine of the part picks one
+for every call from a cheap statistic of the input (a line count, a pattern length)::
+
+    python -m aoc.tuning               # measure the tuned parts, stored for this machine
+    python -m aoc.tuning 12/2          # only some parts
+    AOC_ENGINE=auto python -m aoc.schedule
+
+A part takes part by registering its `auto` engine next to the others::
+
+    tuning.auto(part_two, stat=length)
+"""
+
+from __future__ import annotations
+
+import argparse
+import doctest
+import gc
+import math
+import platform
+import random
+import sys
+import time
+from typing import Any, Callable
+
+from aoc import baseline, days, engines, generate, scaling
+
+Sample = Callable[[random.Random, int], list[str]]
+
+samples: dict[str, Sample] = {}
+
+# the sizes the engines are timed at, for every tuned day
+sizes: dict[str, tuple[int, ...]] = {
+    "12": (8, 12, 16, 24, 32),
+    "19": (10, 100, 1_000, 10_000),
+}
+
+_breakpoints: dict[str, list[tuple[int, str]]] | None = None
+
+
+def sample(day: str) -> Callable[[Sample], Sample]:
+    def register(fn: Sample) -> Sample:
+        samples[day] = fn
+        return fn
+
+    return register
+
+
+def path() -> str:
+    """Return the file of the measured crossovers, in the cache directory of the user."""
+    return baseline.cache("tuning.json", "AOC_TUNING")
+
+
+def load() -> dict[str, list[tuple[int, str]]]:
+    """Return the breakpoints of the tuned parts measured on this machine."""
+    global _breakpoints
+    if _breakpoints is None:
+        stored = baseline.read(path(), platform.node())
+        _breakpoints = {key: [(at, name) for at, name in bps] for key, bps in stored.items()}
+    return _breakpoints
+
+
+def save(breakpoints: dict[str, list[tuple[int, str]]]) -> None:
+    global _breakpoints
+    baseline.update(path(), platform.node(), breakpoints)
+    _breakpoints = None
+
+
+def choose(breakpoints: list[tuple[int, str]], size: int) -> str:
+    """Return the engine of the last breakpoint at or below the size.
+
+    >>> breakpoints = [(0, "reference"), (24, "table")]
+    >>> choose(breakpoints, 8), choose(breakpoints, 24), choose([], 10**6)
+    ('reference', 'table', 'reference')
+    """
+    picked = engines.reference
+    for at, name in breakpoints:
+        if size >= at:
+            picked = name
+    return picked
+
+
+def auto(part: engines.Dispatcher, stat: Callable[[list[str]], int]) -> None:
+    """Register the `auto` engine of the part, picking an engine by the stat of the input."""
+    key = f"{part.day}/{part.part}"
+
+    @part.register("auto")
+    def pick(puzzle: list[str], *args: Any, **kwargs: Any) -> Any:
+        puzzle = list(puzzle)  # read once, measured and solved
+        return part.engines[choose(load().get(key, []), stat(puzzle))](puzzle, *args, **kwargs)
+
+
+def measure(key: str, repeat: int = 3) -> list[tuple[int, str]]:
+    """Return the breakpoints of the part, the sizes from which another engine is the fastest.
+
+    >>> breakpoints = measure("12/1", repeat=1)
+    >>> breakpoints[0][0], {name for _, name in breakpoints} <= {"reference", "table"}
+    (0, True)
+    """
+    day, part = key.split("/")
+    fn, rng, breakpoints = getattr(days.load(day), days.parts[int(part) - 1]), random.Random(0), []
+    for size in sizes[day]:
+        puzzle, best = samples[day](rng, size), (math.inf, engines.reference)
+        for name, engine in sorted(fn.engines.items()):
+            if name == "auto":
+                continue
+            for _ in range(repeat):
+                scaling.uncache(day)
+                gc.collect()
+                start = time.perf_counter()
+                engine(puzzle)
+                best = min(best, (time.perf_counter() - start, name))
+        if not breakpoints or breakpoints[-1][1] != best[1]:
+            breakpoints.append((size if breakpoints else 0, best[1]))
+    return breakpoints
+
+
+@sample("12")
+def day12(rng: random.Random, size: int) -> list[str]:
+    """Return records which patterns are `size` springs long."""
+    lines = []
+    for _ in range(20):
+        springs = "".join(rng.choices(".#", k=size - 1)) + "#"
+        groups = [len(g) for g in springs.split(".") if g]
+        masked = "".join(c if rng.random() < 0.4 else "?" for c in springs)
+        lines.append(f"{masked} {','.join(map(str, groups))}\n")
+    return lines
+
+
+@sample("19")
+def day19(rng: random.Random, size: int) -> list[str]:
+    """Return the workflows of a generated input with `size` parts to classify."""
+    workflows = generate.generate("19", 1)
+    workflows = workflows[: workflows.index("\n") + 1]
+    parts = [
+        "{" + ",".join(f"{c}={rng.randint(1, 4000)}" for c in "xmas") + "}\n" for _ in range(size)
+    ]
+    return workflows + parts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("parts", nargs="*", help="the tuned parts, as 12/2 (all of them)")
+    args = parser.parse_args(argv)
+
+    tuned = [
+        f"{day}/{part}"
+        for day in sizes
+        for part, name in enumerate(days.parts, start=1)
+        if "auto" in getattr(getattr(days.load(day), name), "engines", {})
+    ]
+    measured = {key: measure(key) for key in args.parts or tuned}
+    for key, breakpoints in measured.items():
+        print(key, "  ".join(f"{name} from {at}" for at, name in breakpoints))
+    save(measured)
+    print(f"stored in {path()} for {platform.node()}", file=sys.stderr)
+    return 0
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite())
+    return tests
+
+
+if __name__ == "__main__":
+    sys.exit(main())